@@ -0,0 +1,106 @@
+"""asyncio versions of the lookups in utils.py.
+
+Same cache, snapshot, name index, circuit breaker and parsing as the sync
+path (utils.fetch_local / before_upstream / after_upstream); only the HTTP
+call goes through aioclient instead of requests. The shared steps touch
+SQLite, the snapshot or (the first time) fetch the name list, so they run
+in the loop's default executor rather than on the loop itself. One event
+loop can keep hundreds of lookups in flight:
+
+    results = await aio.get_many_pokemon(names, concurrency=200, timeout=10)
+"""
+import asyncio
+
+import requests
+
+import aioclient
+import utils
+from circuit import CircuitOpenError
+from utils import LookupResult, normalize_name
+
+DEFAULT_CONCURRENCY = 100
+
+_flights = {}
+
+
+async def fetch_pokemon(clean_name: str):
+    """Async utils.fetch_pokemon: (status_code, Pokemon, stale); network errors are raised.
+
+    Concurrent calls for the same name on one event loop share one request.
+    """
+    local = await asyncio.to_thread(utils.fetch_local, clean_name)
+    if local is not None:
+        return local
+    key = (asyncio.get_running_loop(), clean_name)
+    task = _flights.get(key)
+    if task is None:
+        task = _flights[key] = asyncio.ensure_future(_fetch_upstream(clean_name))
+        task.add_done_callback(lambda done: _forget_flight(key, done))
+    # shield: one waiter being cancelled must not cancel the request for the others
+    return await asyncio.shield(task)
+
+
+def _forget_flight(key, task):
+    _flights.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # retrieved here too, in case every waiter was cancelled
+
+
+async def _fetch_upstream(clean_name: str):
+    entry, answer = await asyncio.to_thread(utils.before_upstream, clean_name)
+    if answer is not None:
+        return answer
+    try:
+        response = await aioclient.get(utils.pokemon_url(clean_name),
+                                       headers=entry.validators() if entry is not None else {})
+    except requests.exceptions.RequestException:
+        stale = utils.upstream_failed(entry)
+        if stale is None:
+            raise
+        return stale
+    return await asyncio.to_thread(utils.after_upstream, clean_name, entry, response)
+
+
+async def lookup(pokemon_name: str, timeout=None) -> LookupResult:
+    """Async utils.lookup. A lookup slower than `timeout` seconds comes back with a TimeoutError."""
+    clean_name = normalize_name(pokemon_name)
+    if not clean_name:
+        return LookupResult(clean_name, None, None, ValueError("empty Pokemon name"))
+
+    index = await asyncio.to_thread(utils.get_name_index)
+    if index is not None and not clean_name.isdigit() and clean_name not in index:
+        return LookupResult(clean_name, 404, None, suggestions=tuple(index.suggest(clean_name)))
+    try:
+        status, data, stale = await asyncio.wait_for(fetch_pokemon(clean_name), timeout)
+        return LookupResult(clean_name, status, data, stale=stale)
+    except asyncio.TimeoutError:
+        return LookupResult(clean_name, None, None, TimeoutError(f"Looking up {clean_name!r} timed out"))
+    except (requests.exceptions.RequestException, CircuitOpenError) as e:
+        return LookupResult(clean_name, None, None, e)
+
+
+async def get_pokemon_data(pokemon_name: str, timeout=None):
+    """Async utils.get_pokemon_data: the Pokemon, or None (printing network errors)."""
+    result = await lookup(pokemon_name, timeout=timeout)
+    if result.error is not None and result.name:
+        print(f"Network error: {result.error}")
+    return result.data
+
+
+async def get_many_pokemon(names, concurrency=DEFAULT_CONCURRENCY, timeout=None):
+    """Look up many Pokemon at once, returning LookupResults in input order.
+
+    At most `concurrency` lookups are in flight; duplicate names are fetched
+    once. `timeout` applies to each lookup. Cancelling the call cancels every
+    lookup still running.
+    """
+    clean_names = [normalize_name(name) for name in names]
+    unique = list(dict.fromkeys(clean_names))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded(name):
+        async with semaphore:
+            return await lookup(name, timeout=timeout)
+
+    results = dict(zip(unique, await asyncio.gather(*(bounded(name) for name in unique))))
+    return [results[name] for name in clean_names]
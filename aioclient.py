@@ -0,0 +1,212 @@
+"""A small asyncio HTTP/1.1 client for the PokeAPI, with no extra dependencies.
+
+The asyncio counterpart of client.py: keep-alive connections pooled per host,
+the same timeouts, retries (jittered backoff, Retry-After), per-host token
+bucket and adaptive concurrency limit. Only what the lookups need is
+implemented: GET, JSON bodies sent with Content-Length or chunked
+encoding. Failures are raised as the matching requests exceptions, so
+callers handle both clients the same way.
+
+Connections belong to the event loop that opened them; get_session()
+returns one session per running loop.
+"""
+import asyncio
+import json
+import ssl
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import client
+import metrics
+import ratelimit
+
+USER_AGENT = "pokemon-battle-arena"
+MAX_HEADER_LINES = 100
+
+
+class Response:
+    """The parts of requests.Response that the lookups use."""
+
+    def __init__(self, url, status_code, reason, headers, content):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} {self.reason} for url: {self.url}")
+
+    def close(self):
+        pass
+
+
+class AsyncSession:
+    def __init__(self, pool_size=client.POOL_SIZE):
+        self.pool_size = pool_size
+        self._idle = {}
+        self._ssl = None
+
+    async def _connect(self, scheme, host, port, timeout):
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        return await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context, server_hostname=host if context else None),
+            timeout,
+        )
+
+    async def request(self, url: str, headers=None, timeout=None) -> Response:
+        """One GET on a pooled connection (a stale pooled connection is replaced once)."""
+        connect_timeout, read_timeout = timeout or (client.CONNECT_TIMEOUT, client.READ_TIMEOUT)
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}", f"User-Agent: {USER_AGENT}",
+                 "Accept: application/json", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        idle = self._idle.setdefault(key, [])
+        while True:
+            reused = bool(idle)
+            try:
+                if reused:
+                    reader, writer = idle.pop()
+                else:
+                    reader, writer = await self._connect(scheme, parts.hostname, port, connect_timeout)
+            except asyncio.TimeoutError as e:
+                raise requests.exceptions.ConnectTimeout(f"Connecting to {parts.netloc} timed out") from e
+            except OSError as e:
+                raise requests.exceptions.ConnectionError(f"Could not connect to {parts.netloc}: {e}") from e
+
+            try:
+                writer.write(payload)
+                await writer.drain()
+                response, keep_alive = await asyncio.wait_for(self._read_response(url, reader), read_timeout)
+            except asyncio.TimeoutError as e:
+                writer.close()
+                raise requests.exceptions.ReadTimeout(f"Reading from {parts.netloc} timed out") from e
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                writer.close()
+                if reused:
+                    continue  # the server closed an idle connection; try a fresh one
+                raise requests.exceptions.ConnectionError(f"Connection to {parts.netloc} failed: {e}") from e
+            except BaseException:
+                writer.close()  # cancelled mid-response: the connection can't be reused
+                raise
+
+            if keep_alive and len(idle) < self.pool_size:
+                idle.append((reader, writer))
+            else:
+                writer.close()
+            return response
+
+    async def _read_response(self, url, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        version, status, *reason = status_line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        headers = CaseInsensitiveDict()
+        for _ in range(MAX_HEADER_LINES):
+            line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip()] = value.strip()
+        else:
+            raise ValueError("too many response headers")
+
+        status = int(status)
+        if status in (204, 304) or 100 <= status < 200:
+            content = b""
+        elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # trailers
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            content = b"".join(chunks)
+        elif "Content-Length" in headers:
+            content = await reader.readexactly(int(headers["Content-Length"]))
+        else:
+            return Response(url, status, reason[0] if reason else "", headers, await reader.read()), False
+
+        keep_alive = version == "HTTP/1.1" and headers.get("Connection", "").lower() != "close"
+        return Response(url, status, reason[0] if reason else "", headers, content), keep_alive
+
+    async def get(self, url: str, headers=None, timeout=None, retries=None) -> Response:
+        """GET with the same retry policy as client.get, sharing its per-host limiter."""
+        retries = client.MAX_RETRIES if retries is None else retries
+        limiter = ratelimit.limiter_for(url)
+        for attempt in range(retries + 1):
+            started = await limiter.acquire_async()
+            response = None
+            try:
+                response = await self.request(url, headers=headers, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                metrics.inc("pokeapi_requests_total", status=type(e).__name__)
+                retryable = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if attempt == retries or not retryable:
+                    raise
+            finally:
+                # Cancelled lookups give their slot back too
+                if response is None:
+                    limiter.release(started, failed=True)
+                else:
+                    limiter.release(started, response.status_code)
+            if response is None:
+                await asyncio.sleep(client.backoff_delay(attempt))
+                continue
+            if metrics.ENABLED:
+                client.record_metrics(response.status_code, len(response.content), time.monotonic() - started)
+
+            if response.status_code not in client.RETRY_STATUSES or attempt == retries:
+                return response
+            delay = client.retry_after_seconds(response)
+            await asyncio.sleep(min(client.BACKOFF_MAX, delay) if delay is not None else client.backoff_delay(attempt))
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+_sessions = weakref.WeakKeyDictionary()
+
+
+def get_session() -> AsyncSession:
+    """The shared session for the running event loop."""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None:
+        session = _sessions[loop] = AsyncSession()
+    return session
+
+
+async def get(url: str, headers=None, timeout=None, retries=None) -> Response:
+    return await get_session().get(url, headers=headers, timeout=timeout, retries=retries)
+
+
+def close_session():
+    """Close the running loop's pooled connections."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        session.close()
@@ -1,7 +1,13 @@
 import streamlit as st
 import time
-import base64
-import requests
+from functools import lru_cache
+from html import escape
+from artwork import artwork_url
+from assets import asset_url
+import metrics
+import warmup
+from model import STAT_NAMES
+from utils import lookup
 
 # Page Configuration
 st.set_page_config(
@@ -10,6 +16,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Load popular Pokemon into the caches in the background (once per server process)
+warmup.start()
+
 # Custom CSS for the VS battle style
 st.markdown("""
             <style>
@@ -69,150 +78,106 @@ st.markdown("""
 
 def get_pokemon_data(pokemon_name):
     """Fetch Pokemon Data from PokeAPI"""
-    try:
-        # Strip whitespace and convert to lowercase
-        clean_name = pokemon_name.strip().lower()
-        response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{clean_name}")
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
-    except Exception as e:
-        st.error(f"Error fetching data: {e}")
-        return None
+    result = lookup(pokemon_name)
+    if result.error is not None and result.name:
+        st.error(f"Error fetching data: {result.error}")
+    return result.data
     
-def display_pokemon_card(data, column):
-    """Display Pokemon Information in a card format"""
-    if data:
-        with column:
-            # Pokemon Name - Clean and Bold
-            st.markdown(f"""
-                    <div style='
-                        text-align: center;
-                        font-size: 48px;
-                        font-weight: 900;
-                        color: #4361EE;
-                        margin: 30px 0 20px 0;
-                        letter-spacing: 2px;
-                        text-transform: uppercase;
-                    '>
-                        {data['name']}
-                    </div>
+TYPE_COLORS = {
+    'normal': '#A8A878', 'fire': '#F08030', 'water': '#6890F0',
+    'electric': '#F8D030', 'grass': '#78C850', 'ice': '#98D8D8',
+    'fighting': '#C03028', 'poison': '#A040A0', 'ground': '#E0C068',
+    'flying': '#A890F0', 'psychic': '#F85888', 'bug': '#A8B820',
+    'rock': '#B8A038', 'ghost': '#705898', 'dragon': '#7038F8',
+    'dark': '#705848', 'steel': '#B8B8D0', 'fairy': '#EE99AC'
+}
 
-                """, unsafe_allow_html=True)
-            
-            # Types with colored badges
-            types = [t['type']['name'] for t in data['types']]
-            type_colors = {
-                'normal': '#A8A878', 'fire': '#F08030', 'water': '#6890F0',
-                'electric': '#F8D030', 'grass': '#78C850', 'ice': '#98D8D8',
-                'fighting': '#C03028', 'poison': '#A040A0', 'ground': '#E0C068',
-                'flying': '#A890F0', 'psychic': '#F85888', 'bug': '#A8B820',
-                'rock': '#B8A038', 'ghost': '#705898', 'dragon': '#7038F8',
-                'dark': '#705848', 'steel': '#B8B8D0', 'fairy': '#EE99AC'
-            }
 
-            # Type section with header
-            st.markdown("""
-                    <div style='
-                        text-align: center;
-                        margin: 30px 0 15px 0;
-                    '>
-                        <span style='
-                            color: #EF233C;
-                            font-size: 24px;
-                            font-weight: bold;
-                            text-transform: uppercase;
-                        '>Type</span>
-                    </div>
-            """, unsafe_allow_html=True)
-            
-            type_html = " ".join([
-                f"<span style='background-color: {type_colors.get(t, '#777')}; color: white; padding: 8px 20px; border radius: 25px; margin: 5px; display: inline-block; font-size: 18px; font-weight: 600;'>{t.upper()}</span>"
-                for t in types
-            ])
-            st.markdown(f"<div style='text-align: center; margin: 15px 0;'>{type_html}</div>", unsafe_allow_html=True)
+def _compact(template: str) -> str:
+    """Strip indentation and blank lines, which Markdown would turn into code blocks."""
+    return "\n".join(line.strip() for line in template.splitlines() if line.strip())
 
-            # Stats section
-            st.markdown("""
-                    <div style='
-                        text-align: center;
-                        margin: 30px 0 15px 0;
-                    '>
-                        <span style='
-                            color: #EF233C;
-                            font-size: 24px;
-                            font-weight: bold;
-                            text-transform: uppercase;
-                        '>Stats</span>
-            """, unsafe_allow_html=True)
 
-            # Display individual stats
-            total_stats = 0
-            for stat in data['stats']:
-                stat_name = stat['stat']['name'].replace('-', ' ').upper()
-                stat_value = stat['base_stat']
-                total_stats += stat_value
+# Section header shared by the card's Type / Stats / Total Stats / Abilities blocks
+SECTION_HEADER = _compact("""
+    <div style='text-align: center; margin: 30px 0 15px 0;'>
+        <span style='color: #EF233C; font-size: 24px; font-weight: bold; text-transform: uppercase;'>{title}</span>
+    </div>""")
 
-                # Create stat bar
-                st.markdown(f"""
-                    <div style='margin: 10px 0; text-align: left;'>
-                        <div style='display: flex; justify-content: space-between; margin-bottom: 5px;'>
-                            <span style='color: #F9C74F; font-weight: 600;  font-size: 16px;'>{stat_name}</span>
-                            <span style='color: #FFFFFF; font-weight: bold; font-size: 16px;'>{stat_value}</span>
-                        </div>
-                        <div style='background-color: rgba(67, 97, 238, 0.3); border-radius: 10px; height: 20px; overflow: hidden;'>
-                            <div style='background-color: #4361EE; height: 100%; width: {(stat_value/255)*100}%; border-radius: 10px;'></div>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+TYPE_BADGE = ("<span style='background-color: {color}; color: white; padding: 8px 20px; border-radius: 25px; "
+              "margin: 5px; display: inline-block; font-size: 18px; font-weight: 600;'>{type}</span>")
 
-                # Total Stats section
-                st.markdown(f"""
-                    <div style='
-                        text-align:center;
-                        margin= 30px 0 15px 0;
-                    '>
-                        <span style='
-                            color: #EF233C;
-                            font-size: 24px;
-                            font-weight: bold;
-                            text-transform: uppercase;
-                        '>Total Stats</span>
-                    </div>
-                    <div style='
-                        text-align: center;
-                        font-size: 42px;
-                        font-weight: bold;
-                        color: #F9C74F;
-                    '>
-                        {total_stats}
-                    </div>
-                """, unsafe_allow_html=True)
+STAT_BAR = _compact("""
+    <div style='margin: 10px 0; text-align: left;'>
+        <div style='display: flex; justify-content: space-between; margin-bottom: 5px;'>
+            <span style='color: #F9C74F; font-weight: 600; font-size: 16px;'>{name}</span>
+            <span style='color: #FFFFFF; font-weight: bold; font-size: 16px;'>{value}{top}</span>
+        </div>
+        <div style='background-color: rgba(67, 97, 238, 0.3); border-radius: 10px; height: 20px; overflow: hidden;'>
+            <div style='background-color: #4361EE; height: 100%; width: {percent:.1f}%; border-radius: 10px;'></div>
+        </div>
+    </div>""")
+
+STAT_TOP = " <span style='color: #AAAAAA; font-weight: normal; font-size: 13px;'>({label})</span>"
+TOTAL_RANK = ("<div style='text-align: center; color: #AAAAAA; font-size: 16px;'>"
+              "{label} of {count:,} Pokemon (#{rank:,})</div>")
+
+ABILITY = "<span style='color: #F9C74F; font-size: 20px; font-weight: 600;'>{ability}</span>"
+
+# The whole card in one st.markdown call: one websocket delta per Pokemon instead of a dozen
+CARD_TEMPLATE = _compact("""
+<div>
+    <div style='text-align: center; font-size: 48px; font-weight: 900; color: #4361EE;
+                margin: 30px 0 20px 0; letter-spacing: 2px; text-transform: uppercase;'>{name}</div>
+    {type_header}
+    <div style='text-align: center; margin: 15px 0;'>{types}</div>
+    {stats_header}
+    {stats}
+    {total_header}
+    <div style='text-align: center; font-size: 42px; font-weight: bold; color: #F9C74F;'>{total}</div>
+    {total_rank}
+    {abilities_header}
+    <div style='text-align: center; margin: 10px 0;'>{abilities}</div>
+</div>
+""")
+_HEADERS = {
+    f"{key}_header": SECTION_HEADER.format(title=title)
+    for key, title in [("type", "Type"), ("stats", "Stats"), ("total", "Total Stats"), ("abilities", "Abilities")]
+}
 
-                # Abilities section
-                st.markdown("""
-                    <div style='
-                        text-align: center;
-                        margin: 30px 0 15px 0;
-                    '>
-                        <span style='
-                            color: #EF233C;
-                            font-size: 24px;
-                            font-weight: bold;
-                            test-transform: uppercase;
-                        '>Abilities</span>
-                    </div>
-                """, unsafe_allow_html=True)
 
-                abilities= [a['ability']['name'].replace('-', ' ').title() for a in data['abilities']]
-                abilities_html = ",".join([
-                    f"<span style='color: #F9C74F; font-size: 20px; font-weight: 600;'>{ability}</span>"
-                    for ability in abilities
-                ])
-                st.markdown(f"<div style='text-align: center; margin: 10px 0;'>{abilities_html}</div>", unsafe_allow_html=True)
+@lru_cache(maxsize=512)
+def render_card(name: str, types: tuple, stats: tuple, abilities: tuple, placements: tuple = ()) -> str:
+    """The stat card's HTML, memoized so re-rendering a Pokemon costs a dict lookup.
 
-                return total_stats
+    placements holds ranks.Placement values for the total and each stat, if known.
+    """
+    total_rank, *stat_ranks = placements or (None,) * (len(STAT_NAMES) + 1)
+    return CARD_TEMPLATE.format(
+        name=escape(name),
+        types=" ".join(TYPE_BADGE.format(color=TYPE_COLORS.get(t, '#777'), type=escape(t.upper())) for t in types),
+        stats="".join(
+            STAT_BAR.format(name=stat_key.replace('-', ' ').upper(), value=value, percent=min(value, 255) / 255 * 100,
+                            top=STAT_TOP.format(label=rank.label) if rank else "")
+            for stat_key, value, rank in zip(STAT_NAMES, stats, stat_ranks)
+        ),
+        total=sum(stats),
+        total_rank=TOTAL_RANK.format(label=total_rank.label.upper(), count=total_rank.count, rank=total_rank.rank)
+        if total_rank else "",
+        abilities=",".join(ABILITY.format(ability=escape(a.replace('-', ' ').title())) for a in abilities),
+        **_HEADERS,
+    )
+
+
+def display_pokemon_card(data, column):
+    """Display Pokemon Information in a card format"""
+    if data:
+        with column, metrics.timer("pokedex_render_seconds", component="card"):
+            import ranks
+            placements = tuple(ranks.placements(data).values())
+            st.markdown(render_card(data.name, tuple(data.types), tuple(data.stats), tuple(data.abilities), placements),
+                        unsafe_allow_html=True)
+        return data.total
     return 0
     
     # Main App
@@ -235,7 +200,7 @@ def display_pokemon_card(data, column):
         # Compare button (centered)
         col_btn1, col_btn2, col_btn3 = st.columns([1, 1, 1])
         with col_btn2:
-            compare_button = st.button("⚔️ COMPARE", use_container_width=True,type="primary")
+            compare_button = st.button("⚔️ COMPARE", width="stretch",type="primary")
         
         if compare_button and pokemon1 and pokemon2:
             st.session_state.show_comparison = True
@@ -260,23 +225,17 @@ def display_pokemon_card(data, column):
 
         if data and data2:
             # Get Pokemon Sprites
-            sprite1 = data1['sprites']['other']['official-artwork']['front-default']
-            sprite2 = data2['sprites']['other']['official-artwork']['front_default']
+            sprite1 = artwork_url(data1.artwork)
+            sprite2 = artwork_url(data2.artwork)
 
             # Use st.image with columns for overlay effect
-            import base64
-            from pathlib import Path
-
-            # Read and encode the VS image
-            vs_image_path = Path("images/pokemon.png")
-            if vs_image_path.exists():
-                with open(vs_image_path, "rb") as f:
-                    vs_image_data = base64.b64encode(f.read()).decode()
-
-                # Create HTML with base64 encoded image
+            # The VS image is served as a cached static file instead of a base64 data URI
+            vs_image_url = asset_url("Images/pokemon.png")
+            if vs_image_url:
+                # Create HTML with the VS image URL
                 vs_html = f"""
                 <div style="position: relative; width: 100%; margin: 20px 0;">
-                    <img src="data:image/png;base64,{vs_image_data}" style="width: 100%; display: block;">
+                    <img src="{vs_image_url}" style="width: 100%; display: block;">
                     <img src="{sprite1}" style="position: absolute; left: 8%; top:50%; transform: translateY(-50%); width: 350px; max-width: 25%;">
                     <img src="{sprite2}" style="position: absolute; right: 8%; top: 50%; transform: translateY(-50%); width: 350px; max-width: 25%;">
                 </div>
@@ -0,0 +1,132 @@
+"""Local cache of official artwork, stored as small resized WebP variants.
+
+The official artwork PNGs are ~500 KB each and live on a third-party host.
+Each image is downloaded once, resized into every variant in VARIANTS and
+kept on disk under ARTWORK_DIR, with the least recently used files evicted
+once the directory grows past ARTWORK_MAX_BYTES.
+"""
+import hashlib
+import os
+import threading
+from io import BytesIO
+
+from PIL import Image
+
+import client
+from assets import STATIC_DIR, STATIC_URL
+
+# Inside Streamlit's static folder, so the files can also be served by URL
+ARTWORK_DIR = os.environ.get("POKEDEX_ARTWORK_DIR", os.path.join(STATIC_DIR, "artwork"))
+ARTWORK_MAX_BYTES = int(os.environ.get("POKEDEX_ARTWORK_MAX_BYTES", 100 * 1024 * 1024))
+
+# Variant name -> longest side in pixels
+VARIANTS = {"thumb": 120, "card": 360}
+QUALITY = 85
+
+_key_locks = {}
+_key_locks_lock = threading.Lock()
+
+
+def _key(url: str) -> str:
+    return hashlib.sha1(url.encode()).hexdigest()[:20]
+
+
+def variant_path(url: str, variant: str) -> str:
+    return os.path.join(ARTWORK_DIR, f"{_key(url)}-{variant}.webp")
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _key_locks_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def get_artwork(url, variant="card"):
+    """Local path of a resized artwork variant, downloading it on first use.
+
+    Returns None when there is no URL or the image can't be fetched,
+    decoded or saved, so callers can fall back to the remote URL.
+    """
+    if not url:
+        return None
+    path = variant_path(url, variant)
+    if _touch(path):
+        return path
+
+    # Only one thread downloads a given image; the others wait for its files
+    with _lock_for(_key(url)):
+        if _touch(path):
+            return path
+        try:
+            response = client.get(url)
+            if response.status_code != 200:
+                return None
+            image = Image.open(BytesIO(response.content))
+            image.load()
+            _save_variants(url, image)
+        except (*client.request_errors(), OSError, ValueError, Image.DecompressionBombError) as e:
+            # Unreachable, undecodable or too large an image, or a full or read-only disk
+            print(f"Artwork error for {url}: {e}")
+            return None
+    evict()
+    return path
+
+
+def artwork_url(url, variant="card"):
+    """Browser URL for an artwork variant via Streamlit static serving.
+
+    Falls back to the remote URL if the image can't be cached or the cache
+    lives outside the static folder.
+    """
+    path = get_artwork(url, variant)
+    if path is None:
+        return url
+    relative = os.path.relpath(path, STATIC_DIR)
+    if relative.startswith(".."):
+        return url
+    return f"{STATIC_URL}/{relative.replace(os.sep, '/')}"
+
+
+def _save_variants(url, image):
+    os.makedirs(ARTWORK_DIR, exist_ok=True)
+    image = image.convert("RGBA")
+    for name, size in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        path = variant_path(url, name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            resized.save(tmp_path, "WEBP", quality=QUALITY, method=4)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def _touch(path) -> bool:
+    """Mark a cached file as recently used; False if it isn't cached."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def evict(max_bytes=ARTWORK_MAX_BYTES):
+    """Delete least recently used files until the cache fits in max_bytes."""
+    try:
+        entries = [e for e in os.scandir(ARTWORK_DIR) if e.is_file() and e.name.endswith(".webp")]
+    except FileNotFoundError:
+        return
+    stats = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries]
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
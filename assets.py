@@ -0,0 +1,75 @@
+"""Static assets (background music, VS image, Images/) served by URL.
+
+Each file is copied once into static/assets under a content-hashed name,
+so Streamlit's static file serving hands it to the browser and the browser
+can cache it for good. Results are memoized per process and invalidated
+when the source file's mtime or size changes, so a rerun costs one stat()
+instead of reading and base64-encoding megabytes.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+import re
+import shutil
+import threading
+from urllib.parse import quote
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(ROOT_DIR, "static")
+ASSETS_DIR = os.path.join(STATIC_DIR, "assets")
+STATIC_URL = "app/static"
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def _resolve(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(ROOT_DIR, path)
+
+
+def _memoized(kind, path, build):
+    """build(path) once per (kind, file version); None if the file is missing."""
+    path = _resolve(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _memo.get((kind, path))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    value = build(path)
+    with _memo_lock:
+        _memo[(kind, path)] = (version, value)
+    return value
+
+
+def _publish(path: str) -> str:
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    stem, ext = os.path.splitext(os.path.basename(path))
+    name = f"{re.sub(r'[^A-Za-z0-9_.-]+', '-', stem).strip('-')}-{digest}{ext.lower()}"
+    target = os.path.join(ASSETS_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(ASSETS_DIR, exist_ok=True)
+        tmp_path = f"{target}.{threading.get_ident()}.tmp"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, target)
+    return f"{STATIC_URL}/assets/{quote(name)}"
+
+
+def asset_url(path: str):
+    """Browser URL for a local file (relative paths are from the repo root), or None if missing."""
+    return _memoized("url", path, _publish)
+
+
+def _encode(path: str) -> str:
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def data_uri(path: str):
+    """Memoized base64 data URI, for places that can't load a URL. None if missing."""
+    return _memoized("data", path, _encode)
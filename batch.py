@@ -0,0 +1,170 @@
+"""Non-interactive lookups and battles for scripts and pipelines.
+
+Names (or "a,b" pairs) are read from a file or stdin, fetched with bounded
+parallelism and written as JSON Lines or CSV while they complete, so
+thousands of matchups can be scored without holding them all in memory.
+"""
+import csv
+import json
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from model import STAT_NAMES
+from utils import MAX_WORKERS, lookup
+
+LOOKUP_FIELDS = ["name", "status", "id", "types", "abilities", *STAT_NAMES, "total", "stale", "error"]
+BATTLE_FIELDS = ["p1", "p2", "status", "winner", "total1", "total2",
+                 "sims", "win_rate", "ci_low", "ci_high", "error"]
+
+
+def read_lines(path):
+    """Stripped, non-empty lines from a file ("-" for stdin), skipping # comments."""
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def parse_pair(line: str):
+    """Split "pikachu,charizard", "pikachu charizard" or "pikachu vs charizard" into two names."""
+    parts = [p for p in re.split(r"\s*,\s*|\t|\s+vs\.?\s+|\s+", line.strip(), flags=re.IGNORECASE) if p]
+    if len(parts) != 2:
+        raise ValueError(f"expected two Pokemon, got {line!r}")
+    return parts[0], parts[1]
+
+
+def _status(result) -> str:
+    if result.ok:
+        return "ok"
+    if result.status == 404:
+        return "not_found"
+    return "error"
+
+
+def _error(result):
+    if result.error is not None:
+        return str(result.error)
+    if result.status not in (200, 404):
+        return f"HTTP {result.status}"
+    return None
+
+
+def lookup_record(name: str) -> dict:
+    """One Pokemon as a flat record."""
+    result = lookup(name)
+    record = {"name": result.name or name, "status": _status(result), "stale": result.stale, "error": _error(result)}
+    if result.ok:
+        data = result.data
+        record.update(id=data.id, types=list(data.types), abilities=list(data.abilities),
+                      total=data.total, **dict(zip(STAT_NAMES, data.stats)))
+    return record
+
+
+def battle_record(line: str, sims=1000, seed=None) -> dict:
+    """One matchup as a flat record: the winner by total stats, plus simulated win rate."""
+    try:
+        p1, p2 = parse_pair(line)
+    except ValueError as e:
+        return {"p1": line, "p2": None, "status": "error", "error": str(e)}
+    r1, r2 = lookup(p1), lookup(p2)
+    record = {"p1": r1.name or p1, "p2": r2.name or p2}
+    failed = [r for r in (r1, r2) if not r.ok]
+    if failed:
+        statuses = {_status(r) for r in failed}
+        record["status"] = "error" if "error" in statuses else "not_found"
+        record["error"] = "; ".join(f"{r.name}: {_error(r) or 'not found'}" for r in failed)
+        return record
+
+    total1, total2 = r1.data.total, r2.data.total
+    record.update(status="ok", total1=total1, total2=total2,
+                  winner=r1.name if total1 > total2 else r2.name if total2 > total1 else None)
+    if sims:
+        from simulator import simulate
+        sim = simulate(r1.data, r2.data, n=sims, seed=seed)
+        low, high = sim.confidence_interval()
+        record.update(sims=sim.n, win_rate=round(sim.win_rate, 4), ci_low=round(low, 4), ci_high=round(high, 4))
+    return record
+
+
+def stream(fn, items, workers=MAX_WORKERS, ordered=True):
+    """Yield fn(item) for every item, at most `workers` at a time.
+
+    Only a small window of items is read ahead, so huge (or endless) inputs
+    stream in constant memory. With ordered=False results come out as they
+    complete instead of in input order.
+    """
+    items = iter(items)
+    done_marker = object()
+    window = max(1, workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pokedex-batch") as executor:
+        pending = deque() if ordered else set()
+        add = pending.append if ordered else pending.add
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < window:
+                item = next(items, done_marker)
+                if item is done_marker:
+                    exhausted = True
+                else:
+                    add(executor.submit(fn, item))
+            if not pending:
+                return
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    yield future.result()
+
+
+class JsonLinesWriter:
+    def __init__(self, out, fields):
+        self.out = out
+
+    def write(self, record: dict):
+        self.out.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.out.flush()
+
+
+class CsvWriter:
+    def __init__(self, out, fields):
+        self.out = out
+        self.writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, record: dict):
+        self.writer.writerow({key: "/".join(value) if isinstance(value, list) else value
+                              for key, value in record.items()})
+        self.out.flush()
+
+
+WRITERS = {"jsonl": JsonLinesWriter, "csv": CsvWriter}
+
+
+def run(fn, items, fields, fmt="jsonl", out=None, workers=MAX_WORKERS, ordered=True) -> dict:
+    """Stream fn over items into `out` (stdout by default); returns a summary."""
+    writer = WRITERS[fmt](out or sys.stdout, fields)
+    counts = Counter()
+    start = time.perf_counter()
+    for record in stream(fn, items, workers=workers, ordered=ordered):
+        writer.write(record)
+        counts[record["status"]] += 1
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    return {
+        "total": total,
+        "ok": counts["ok"],
+        "not_found": counts["not_found"],
+        "error": counts["error"],
+        "seconds": round(elapsed, 3),
+        "per_second": round(total / elapsed, 1) if elapsed else None,
+    }
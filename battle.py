@@ -1,8 +1,11 @@
 import streamlit as st
 import time
 from pathlib import Path
-import base64
-from utils import get_pokemon_data
+from artwork import get_artwork
+from assets import asset_url
+import metrics
+import warmup
+from utils import get_many_pokemon, get_name_index, is_known_name, prefetch
 
 # 1. Page Configuration
 st.set_page_config(
@@ -11,6 +14,9 @@ st.set_page_config(
     layout="wide"
 )
 
+# Load popular Pokemon into the caches in the background (once per server process)
+warmup.start()
+
 # 2. Custom CSS for the VS battle style
 st.markdown("""
             <style>
@@ -60,11 +66,12 @@ def display_pokemon_card(data, column):
     """Display Pokemon Information in a card format"""
     if not data:
         return 0
-    with column:
-        st.markdown(f"<h1 style='text-align: center; color: #4361EE;'>{data['name'].upper()}</h1>", unsafe_allow_html=True)
+    import ranks
+    with column, metrics.timer("pokedex_render_seconds", component="card"):
+        st.markdown(f"<h1 style='text-align: center; color: #4361EE;'>{data.name.upper()}</h1>", unsafe_allow_html=True)
             
         # Type Badges
-        types = [t['type']['name'] for t in data['types']]
+        types = data.types
         type_colors = {
             'normal': '#A8A878', 'fire': '#F08030', 'water': '#6890F0',
             'electric': '#F8D030', 'grass': '#78C850', 'ice': '#98D8D8',
@@ -78,30 +85,101 @@ def display_pokemon_card(data, column):
         st.markdown(f"<div style='text-align: center;'>{type_html}</div>", unsafe_allow_html=True)
 
         # Calculate Total Stats
-        total = sum([s['base_stat'] for s in data['stats']])
+        total = data.total
         st.metric("Total Stats", total)
+        placement = ranks.placements(data).get("total")
+        if placement:
+            stronger = ranks.get_index().stronger(total)
+            st.caption(f"{placement.label.capitalize()} of {placement.count:,} Pokemon (#{placement.rank:,})"
+                       + (f" · next up: {stronger[0].replace('-', ' ').title()} ({stronger[1]})" if stronger else ""))
         return total
 
-def get_base64_audio(file_path):
-    """Converts audio file to base64 so it can be embedded in HTML"""
-    try:
-        with open(file_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    except Exception as e:
-        return None
+def show_evolution_line(data, column):
+    """A fighter's evolution line next to it, with each member's type matchups"""
+    import resources
+    with column:
+        line = resources.evolution_line(data)
+        st.markdown(f"<h3 style='text-align: center; color: #4361EE;'>{data.name.upper()}'S LINE</h3>", unsafe_allow_html=True)
+        st.dataframe(
+            [
+                {"Stage": stage, "Pokemon": species.replace('-', ' ').title() if member is None else member.name.replace('-', ' ').title(),
+                 "Types": "/".join(t.title() for t in member.types) if member else "?",
+                 "Total": member.total if member else None,
+                 "vs " + data.name.title(): f"{member.total - data.total:+d}" if member else None}
+                for stage, species, _, member in line.members
+            ],
+            width="stretch",
+            hide_index=True,
+        )
+        matchups = line.matchups(data)
+        for label, test in (("Weak to", lambda m: m > 1), ("Resists", lambda m: 0 < m < 1), ("Immune to", lambda m: m == 0)):
+            found = [f"{t.title()} ×{m:g}" for t, m in sorted(matchups.items(), key=lambda item: -item[1]) if test(m)]
+            if found:
+                st.caption(f"{label}: {', '.join(found)}")
+        if line.errors:
+            st.warning("Part of the evolution line couldn't be loaded right now.")
+
+def warm_artwork(result):
+    """Cache a fighter's artwork (runs in the background after it is fetched)"""
+    if result.ok:
+        get_artwork(result.data.artwork)
+
+def prefetch_fighter(key):
+    """Start loading a fighter as soon as its name is entered, before FIGHT! is pressed"""
+    name = st.session_state.get(key)
+    if name:
+        prefetch(name, warm=warm_artwork)
+
+def pokemon_input(label, placeholder, key):
+    """Name input with autocomplete from the local name index (plain text input without one)"""
+    index = get_name_index()
+    if index is None:
+        return st.text_input(label, placeholder=placeholder, key=key, on_change=prefetch_fighter, args=(key,))
+    return st.selectbox(label, index.names, index=None, placeholder=placeholder, key=key,
+                        on_change=prefetch_fighter, args=(key,),
+                        accept_new_options=True, format_func=lambda n: n.replace('-', ' ').title())
+
+def show_debug_panel():
+    """Fetch/render metrics for this process in the sidebar of a session opened with ?debug=1"""
+    if not st.session_state.get("debug"):
+        return
+    if not metrics.ENABLED:
+        st.sidebar.info("🔧 Metrics are off. Start the server with POKEDEX_METRICS=1 to collect them.")
+        return
+    data = metrics.snapshot()
+    with st.sidebar.expander("🔧 Debug: metrics", expanded=False):
+        st.dataframe(
+            [{"metric": name, "labels": ", ".join(f"{k}={v}" for k, v in labels), "value": value}
+             for (name, labels), value in sorted(data["counters"].items())],
+            hide_index=True,
+        )
+        st.dataframe(
+            [{"histogram": name, "labels": ", ".join(f"{k}={v}" for k, v in labels), "count": h.count,
+              "mean ms": round(h.sum / h.count * 1000, 3) if h.count else None,
+              "p50 ≤ ms": h.quantile(0.5) * 1000 if h.count else None,
+              "p95 ≤ ms": h.quantile(0.95) * 1000 if h.count else None}
+             for (name, labels), h in sorted(data["histograms"].items())],
+            hide_index=True,
+        )
+        st.download_button("Prometheus text", metrics.render(), file_name="pokedex_metrics.prom")
 
 # Main App
 
+# Only this session sees the panel; collecting metrics is the server's choice (POKEDEX_METRICS)
+if st.query_params.get("debug") == "1":
+    st.session_state.debug = True
+
 # Ensures music is always ready to play
+# Served as a cached static file by URL instead of re-encoding it on every rerun
 audio_path = "audio/Aylex - Fighter (freetouse.com).mp3"
-audio_b64 = get_base64_audio(audio_path)
+audio_url = asset_url(audio_path)
 
 # Check if file exists before trying to play it
-if audio_b64:
+if audio_url:
     st.components.v1.html(
         f"""
         <audio id="bg-audio" autoplay loop>
-            <source src="data:audio/mp3;base64,{audio_b64}" type="audio/mp3">
+            <source src="{audio_url}" type="audio/mpeg">
         </audio>
         <script>
             const audio = window.document.getElementById("bg-audio");
@@ -130,14 +208,16 @@ if not st.session_state.show_comparison:
 
     col1, col2 = st.columns(2)
     with col1:
-        p1 = st.text_input("Trainer 1 Pokemon:", placeholder="e.g., Charizard, pikachu")
+        p1 = pokemon_input("Trainer 1 Pokemon:", placeholder="e.g., Charizard, pikachu", key="p1_input")
     with col2:
-        p2 = st.text_input("Player 2 Pokemon:", placeholder="e.g., Blastoise, lucario")
+        p2 = pokemon_input("Player 2 Pokemon:", placeholder="e.g., Blastoise, lucario", key="p2_input")
 
     if st.button("⚔️ FIGHT!"):
         if p1 and p2:
             st.session_state.p1, st.session_state.p2 = p1, p2
             st.session_state.show_comparison = True
+            st.session_state.recorded = False
+            st.session_state.intro_played = False
             st.rerun()
         else:
             st.warning("Please enter names for both combatants!")
@@ -145,17 +225,28 @@ if not st.session_state.show_comparison:
 else:
 
     # THE BATTLE SEQUENCE BEGINS!
-    p1_data = get_pokemon_data(st.session_state.p1)
-    p2_data = get_pokemon_data(st.session_state.p2)
+    names = [st.session_state.p1, st.session_state.p2]
+    if all(is_known_name(name) for name in names):
+        # Fetch both fighters (and warm their artwork) concurrently in the background,
+        # picking up the prefetches started while the names were typed...
+        fighters = [prefetch(name, warm=warm_artwork) for name in names]
+
+        # 1. Battle Intro Animation ...while the intro plays (once per battle, not on every rerun)
+        if not st.session_state.get("intro_played"):
+            banner_place = st.empty()
+            banner_place.markdown("<h1 style='text-align: center;'>READY...</h1>", unsafe_allow_html=True)
+            time.sleep(0.8)
+            banner_place.markdown("<h1 style='text-align: center; color: #EF233C;'>FIGHT!</h1>", unsafe_allow_html=True)
+            time.sleep(0.8)
+            banner_place.empty()
+            st.session_state.intro_played = True
+        results = [fighter.result() for fighter in fighters]
+    else:
+        # Typos are answered locally, no need to wait for the intro
+        results = get_many_pokemon(names)
+    p1_data, p2_data = (r.data for r in results)
 
     if p1_data and p2_data:
-        # 1. Battle Intro Animation
-        banner_place = st.empty()
-        banner_place.markdown("<h1 style='text-align: center;'>READY...</h1>", unsafe_allow_html=True)
-        time.sleep(0.8)
-        banner_place.markdown("<h1 style='text-align: center; color: #EF233C;'>FIGHT!</h1>", unsafe_allow_html=True)
-        time.sleep(0.8)
-        banner_place.empty()
 
         # 2. SHOW THE "FIGHT!" BANNER
         # banner_place = st.empty()
@@ -166,11 +257,11 @@ else:
         # 3. DISPLAY FIGHTERS
         col_img1, col_img2 = st.columns(2)
         with col_img1:
-            img1= p1_data['sprites']['other']['official-artwork'].get('front_default')
-            if img1: st.image(img1, use_container_width=True)
+            img1= p1_data.artwork
+            if img1: st.image(get_artwork(img1) or img1, width="stretch")
         with col_img2:
-            img2= p2_data['sprites']['other']['official-artwork'].get('front_default')
-            if img2: st.image(img2, use_container_width=True)
+            img2= p2_data.artwork
+            if img2: st.image(get_artwork(img2) or img2, width="stretch")
         
         # 4. SHOW THE STAT CARDS
         c1, c2 = st.columns(2)
@@ -195,11 +286,55 @@ else:
         else:
             st.info("The battle is a stalemate! Both Pokemon are equally matched.")
 
+        # Earlier meetings, then log this one (queued, so the page doesn't wait on the disk)
+        import history
+        if not st.session_state.get("recorded"):
+            st.session_state.earlier = history.get_history().head_to_head(p1_data.name, p2_data.name)
+            history.record(p1_data.name, p2_data.name, total1, total2, source="app")
+            st.session_state.recorded = True
+        p1_wins, p2_wins, ties = st.session_state.earlier
+        if p1_wins + p2_wins + ties:
+            st.markdown(f"<div style='text-align: center; color: #AAAAAA;'>📜 Earlier meetings: {p1_data.name.upper()} {p1_wins} – {p2_wins} {p2_data.name.upper()}, {ties} ties</div>", unsafe_allow_html=True)
+
+        # 6. SIMULATED REMATCHES (types, speed and damage rolls), kept for reruns of the same battle
+        if st.session_state.get("sim_for") != (p1_data.name, p2_data.name):
+            from simulator import simulate
+            st.session_state.sim = simulate(p1_data, p2_data, n=10_000)
+            st.session_state.sim_for = (p1_data.name, p2_data.name)
+        sim = st.session_state.sim
+        low, high = sim.confidence_interval()
+        st.markdown(f"""
+            <div style='text-align: center; margin: 20px 0; font-size: 20px;'>
+                🎲 In {sim.n:,} simulated battles, <b>{p1_data.name.upper()}</b> wins
+                <b style='color: #F9C74F;'>{sim.win_rate:.1%}</b> of the time
+                <span style='color: #AAAAAA;'>(95% CI {low:.1%} – {high:.1%})</span>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # 7. EVOLUTION LINES (species, evolution chain and types, fetched only when asked for)
+        if st.toggle("🧬 Compare with their evolution lines"):
+            c1, c2 = st.columns(2)
+            show_evolution_line(p1_data, c1)
+            show_evolution_line(p2_data, c2)
+
+        if any(r.stale for r in results):
+            st.caption("📦 Some stats come from the local cache and are being refreshed.")
+
         if st.button("↩️ New Battle"):
             st.session_state.show_comparison = False
             st.rerun()
+    elif any(r.error is not None or r.status not in (200, 404) for r in results if r.name):
+        st.error("The Pokedex can't reach PokeAPI right now. Try again in a moment!")
+        if st.button("Try Again"):
+            st.session_state.show_comparison = False
+            st.rerun()
     else:
         st.error("One of those Pokemon names was not recognized by the Pokedex!")
+        for r in results:
+            if r.suggestions:
+                st.info(f"Did you mean {' or '.join(s.title() for s in r.suggestions)} instead of '{r.name}'?")
         if st.button("Try Again"):
             st.session_state.show_comparison = False
-            st.rerun()
\ No newline at end of file
+            st.rerun()
+
+show_debug_panel()
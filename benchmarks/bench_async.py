@@ -0,0 +1,63 @@
+"""Sequential vs. thread pool vs. asyncio lookups against an asyncio stub API.
+
+    python -m benchmarks.bench_async [--names 500] [--latency 0.1] [--concurrency 200]
+
+Every run starts from an empty cache, so each lookup is one upstream
+request with --latency seconds of server think time. The sequential and
+thread-pool runs use utils (requests); the asyncio run uses aio on a single
+event loop with up to --concurrency lookups in flight.
+"""
+import argparse
+import asyncio
+import time
+
+import aio
+import ratelimit
+import utils
+from benchmarks.common import isolated
+from benchmarks.fake_pokeapi import AsyncFakePokeAPI
+
+
+def sequential(names):
+    return [utils.lookup(name) for name in names]
+
+
+def thread_pool(names):
+    return utils.get_many_pokemon(names)
+
+
+def event_loop(names, concurrency):
+    return asyncio.run(aio.get_many_pokemon(names, concurrency=concurrency, timeout=30))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--sequential-names", type=int, default=50,
+                        help="the sequential run only looks up this many (it is slow)")
+    args = parser.parse_args()
+
+    runs = [
+        ("sequential", args.sequential_names, sequential),
+        (f"threads ({utils.MAX_WORKERS})", args.names, thread_pool),
+        (f"asyncio ({args.concurrency})", args.names, lambda names: event_loop(names, args.concurrency)),
+    ]
+    with AsyncFakePokeAPI(roster_size=args.names, latency=args.latency) as api:
+        # Measure the fetch paths, not the client-side rate limit
+        ratelimit.configure(api.url, rate=0, initial=args.concurrency, maximum=args.concurrency)
+        for label, count, run in runs:
+            with isolated(api):
+                names = api.roster[:count]
+                hits = api.hits
+                start = time.perf_counter()
+                results = run(names)
+                elapsed = time.perf_counter() - start
+            ok = sum(r.ok for r in results)
+            print(f"{label:16} {ok:>5}/{len(names)} ok in {elapsed:6.2f} s   "
+                  f"{len(names) / elapsed:8.1f} lookups/s   {api.hits - hits} upstream requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Pooled client vs. one-connection-per-request, against the local fake API.
+
+    python -m benchmarks.bench_client [--requests 500]
+
+Only connection reuse is measured here (the cache is bypassed). Against the
+real PokeAPI the gap is larger, since every new connection also pays a TLS
+handshake.
+"""
+import argparse
+import statistics
+import time
+
+import requests
+
+import client
+import ratelimit
+from benchmarks.fake_pokeapi import FakePokeAPI
+
+
+def run(label, fetch, urls):
+    timings = []
+    for url in urls:
+        start = time.perf_counter()
+        fetch(url).content
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{label:28} mean {statistics.mean(timings) * 1000:7.3f} ms   "
+          f"p50 {timings[len(timings) // 2] * 1000:7.3f} ms   "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.3f} ms")
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    with FakePokeAPI(roster_size=50) as api:
+        ratelimit.configure(api.url, rate=0, initial=1)  # sequential anyway; only measure the pool
+        urls = [f"{api.url}/pokemon/{api.roster[i % len(api.roster)]}" for i in range(args.requests)]
+        fresh = run("requests.get (new conn)", lambda url: requests.get(url, timeout=5), urls)
+        pooled = run("client.get (pooled)", client.get, urls)
+        print(f"\nPooled client speedup: {fresh / pooled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
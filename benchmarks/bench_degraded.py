@@ -0,0 +1,60 @@
+"""Lookup latency while the upstream API is slow and failing.
+
+    python -m benchmarks.bench_degraded [--names 20] [--rounds 5] [--latency 1.0]
+
+A cache is warmed from a healthy fake API and then left to go stale. The
+API is then switched to slow 503s. Stale names should still be answered at
+cache-hit speed (stale-while-revalidate), and once the circuit breaker
+opens, uncached names should fail fast instead of waiting out the retries.
+"""
+import argparse
+import time
+
+import client
+import utils
+from benchmarks.common import isolated, percentiles
+from benchmarks.fake_pokeapi import FakePokeAPI
+from cache import get_cache
+
+
+def timed_lookups(names):
+    timings, results = [], []
+    for name in names:
+        start = time.perf_counter()
+        results.append(utils.lookup(name))
+        timings.append(time.perf_counter() - start)
+    return timings, results
+
+
+def report(label, timings, results):
+    p = percentiles(timings)
+    statuses = sorted({(r.status, type(r.error).__name__ if r.error else None, r.stale) for r in results}, key=str)
+    print(f"{label:24} p50 {p['p50_ms']:8.2f} ms   p99 {p['p99_ms']:8.2f} ms   "
+          f"max {p['max_ms']:8.2f} ms   (status, error, stale): {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with FakePokeAPI() as api, isolated(api):
+        get_cache().ttl = 0  # everything we warm is stale straight away
+        cached = api.roster[:args.names]
+        uncached = api.roster[args.names:args.names * 2]
+        report("healthy, cold", *timed_lookups(cached))
+
+        api.latency, api.error_rate = args.latency, 1.0
+        saved_retries, client.MAX_RETRIES = client.MAX_RETRIES, 0
+        try:
+            report("down, stale cached", *timed_lookups(cached * args.rounds))
+            report("down, uncached", *timed_lookups(uncached))
+            print(f"breaker: {utils._breaker.state}, {api.hits} upstream requests in total")
+        finally:
+            client.MAX_RETRIES = saved_retries
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Memory per entry: raw PokeAPI dict vs. the compact Pokemon record.
+
+    python -m benchmarks.bench_memory [--entries 500] [--payload real.json]
+
+By default the payloads come from the fake API generator. Pass a saved
+real /pokemon/{name} response with --payload for realistic sizes (the real
+ones carry far more moves and sprites than the fake ones).
+"""
+import argparse
+import json
+import tracemalloc
+
+from benchmarks.fake_pokeapi import make_pokemon, make_roster
+from model import Pokemon
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=500)
+    parser.add_argument("--payload", help="JSON file with a real /pokemon/{name} response")
+    args = parser.parse_args()
+
+    if args.payload:
+        with open(args.payload) as f:
+            text = f.read()
+        bodies = [text] * args.entries
+    else:
+        bodies = [json.dumps(make_pokemon(name, i + 1, "http://localhost/api/v2"))
+                  for i, name in enumerate(make_roster(args.entries))]
+
+    raw, raw_bytes = measure(lambda: [json.loads(body) for body in bodies])
+    compact, compact_bytes = measure(lambda: [Pokemon.from_api(json.loads(body)) for body in bodies])
+    raw_json = sum(len(body) for body in bodies)
+    compact_json = sum(len(p.dumps()) for p in compact)
+
+    n = args.entries
+    print(f"{'':18}{'in memory':>14}{'serialized':>14}")
+    print(f"{'raw dict':18}{raw_bytes / n:12,.0f} B{raw_json / n:12,.0f} B")
+    print(f"{'Pokemon record':18}{compact_bytes / n:12,.0f} B{compact_json / n:12,.0f} B")
+    print(f"\nReduction: {raw_bytes / compact_bytes:.0f}x in memory, {raw_json / compact_json:.0f}x serialized")
+
+
+if __name__ == "__main__":
+    main()
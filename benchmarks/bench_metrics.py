@@ -0,0 +1,49 @@
+"""Cost of the metrics hooks, disabled and enabled.
+
+    python -m benchmarks.bench_metrics [--calls 1000000]
+
+Disabled hooks should cost well under a microsecond, so they can stay in
+the fetch and render paths.
+"""
+import argparse
+import time
+
+import metrics
+
+
+def per_call(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def timed_block():
+    with metrics.timer("bench_seconds", component="card"):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    hooks = {
+        "inc": lambda: metrics.inc("bench_total", result="hit"),
+        "observe": lambda: metrics.observe("bench_seconds", 0.001),
+        "timer": timed_block,
+        "baseline (empty lambda)": lambda: None,
+    }
+    saved = metrics.ENABLED
+    try:
+        for enabled in (False, True):
+            metrics.enable(enabled)
+            for label, hook in hooks.items():
+                print(f"{'enabled' if enabled else 'disabled':9} {label:24} {per_call(hook, args.calls):8.1f} ns/call")
+    finally:
+        metrics.enable(saved)
+        metrics.reset()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Client-side rate limiting against a fake API that throttles at N req/s.
+
+    python -m benchmarks.bench_ratelimit [--requests 200] [--threads 32] [--ceiling 40]
+
+The fake API answers 429 (Retry-After: 1) beyond --ceiling requests per
+second. The same burst of requests is sent from many threads twice: once
+with no client-side limit, once with the token bucket set just under the
+ceiling. The limited run should see (almost) no 429s and keep throughput
+close to the ceiling instead of stalling in Retry-After sleeps.
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import client
+import ratelimit
+from benchmarks.fake_pokeapi import FakePokeAPI
+
+
+def burst(api, requests, threads):
+    urls = [f"{api.url}/pokemon/{api.roster[i % len(api.roster)]}" for i in range(requests)]
+    statuses = []
+    lock = threading.Lock()
+
+    def fetch(url):
+        status = client.get(url).status_code
+        with lock:
+            statuses.append(status)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(fetch, urls))
+    return statuses, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--ceiling", type=int, default=40, help="requests per second the fake API allows")
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    runs = {
+        "unlimited": dict(rate=0, initial=args.threads, minimum=args.threads, maximum=args.threads),
+        # A burst plus one second of refill must still fit under the ceiling
+        "token bucket": dict(rate=args.ceiling * 0.85, burst=max(1, args.ceiling // 10), maximum=args.threads),
+    }
+    for label, settings in runs.items():
+        with FakePokeAPI(latency=args.latency, rate_limit=args.ceiling) as api:
+            limiter = ratelimit.configure(api.url, **settings)
+            statuses, elapsed = burst(api, args.requests, args.threads)
+            ok = statuses.count(200)
+            print(f"{label:13} {ok}/{len(statuses)} ok in {elapsed:5.2f} s "
+                  f"({ok / elapsed:5.1f} req/s, ceiling {args.ceiling}), "
+                  f"{api.throttled} upstream 429s, {api.hits} upstream requests")
+            print(f"{'':13} limiter: {limiter.metrics()}")
+
+
+if __name__ == "__main__":
+    main()
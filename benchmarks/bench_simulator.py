@@ -0,0 +1,35 @@
+"""Time simulator.simulate for random matchups (target: 10k battles < 100 ms).
+
+    python -m benchmarks.bench_simulator [--pairs 200] [--battles 10000]
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.fake_pokeapi import make_pokemon, make_roster
+from model import Pokemon
+from simulator import simulate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--battles", type=int, default=10_000)
+    args = parser.parse_args()
+
+    roster = [Pokemon.from_api(make_pokemon(name, i + 1, "")) for i, name in enumerate(make_roster(args.pairs + 1))]
+    simulate(roster[0], roster[1], n=args.battles)  # warm-up
+
+    timings = []
+    for p1, p2 in zip(roster, roster[1:]):
+        start = time.perf_counter()
+        simulate(p1, p2, n=args.battles)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{args.battles:,} battles per pair over {len(timings)} pairs: "
+          f"mean {statistics.mean(timings) * 1000:.2f} ms, p50 {timings[len(timings) // 2] * 1000:.2f} ms, "
+          f"max {timings[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
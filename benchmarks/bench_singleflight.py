@@ -0,0 +1,63 @@
+"""Many concurrent sessions asking for the same popular Pokemon.
+
+    python -m benchmarks.bench_singleflight [--threads 200] [--names 5] [--latency 0.3]
+
+Every thread looks up one of a few popular names at the same moment against
+a slow fake API. With request coalescing the upstream sees one request per
+distinct name, however many threads there are. A second round against a
+failing API checks that every waiter gets the error.
+"""
+import argparse
+import threading
+import time
+
+import client
+import utils
+from benchmarks.common import isolated
+from benchmarks.fake_pokeapi import FakePokeAPI
+
+
+def storm(threads, popular):
+    barrier = threading.Barrier(threads)
+    results = [None] * threads
+
+    def worker(i):
+        barrier.wait()
+        results[i] = utils.lookup(popular[i % len(popular)])
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--names", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    with FakePokeAPI(latency=args.latency) as api, isolated(api):
+        popular = api.roster[:args.names]
+        results, elapsed = storm(args.threads, popular)
+        ok = sum(r.ok for r in results)
+        print(f"{args.threads} threads x {len(popular)} names: {api.hits} upstream requests, "
+              f"{ok}/{len(results)} succeeded in {elapsed:.2f} s")
+        assert api.hits == len(popular), "expected one upstream request per distinct name"
+
+    with FakePokeAPI(latency=args.latency, error_rate=1.0) as api, isolated(api):
+        saved_retries, client.MAX_RETRIES = client.MAX_RETRIES, 0  # so each failure is one request
+        try:
+            results, elapsed = storm(args.threads, api.roster[:args.names])
+        finally:
+            client.MAX_RETRIES = saved_retries
+        statuses = {r.status for r in results}
+        print(f"Failing upstream: {api.hits} upstream requests, statuses seen by waiters: {statuses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Startup cost: import time and time-to-first-battle, cold versus warm.
+
+    python -m benchmarks.bench_startup [--runs 5] [--latency 0.25] [--skip-render]
+
+* Import time of pokemon.py, utils and the heavy libraries, each in a fresh
+  interpreter (minus bare interpreter startup), and which heavy modules
+  `import pokemon` pulls in.
+* The CLI's first battle (`pokemon.py battle`) and a single lookup as
+  separate processes: cold (empty cache, no name list) and after
+  `pokemon.py warmup`.
+* The battle page's first render through Streamlit's AppTest, with nothing
+  cached versus after the boot warm-up. It includes the fixed 1.6 s
+  READY/FIGHT intro, which hides fetches shorter than that.
+
+Everything runs against the local fake API with --latency per request.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import warmup
+from benchmarks.common import isolated
+from benchmarks.fake_pokeapi import FakePokeAPI
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("requests", "numpy", "streamlit", "PIL", "concurrent.futures", "http.server")
+
+
+def run_python(args, env=None, stdin=None) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=ROOT_DIR, env=env, input=stdin, text=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def median_ms(fn, runs) -> float:
+    return statistics.median(fn() for _ in range(runs)) * 1000
+
+
+def bench_imports(runs):
+    bare = median_ms(lambda: run_python(["-c", "pass"]), runs)
+    print(f"{'interpreter startup':34} {bare:8.1f} ms")
+    for module in ("pokemon", "utils", "requests", "numpy", "streamlit"):
+        total = median_ms(lambda: run_python(["-c", f"import {module}"]), runs)
+        print(f"{'import ' + module:34} {total - bare:8.1f} ms")
+    probe = f"import sys, pokemon; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    loaded = subprocess.run([sys.executable, "-c", probe], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip()
+    print(f"{'heavy modules after import pokemon':34} {loaded or 'none'}")
+
+
+def cli_env(api, tmp_dir):
+    env = dict(os.environ)
+    env.update(
+        POKEAPI_URL=api.url,
+        POKEDEX_CACHE_PATH=os.path.join(tmp_dir, "cache.sqlite3"),
+        POKEDEX_NAMES_PATH=os.path.join(tmp_dir, "names.json"),
+        POKEDEX_SNAPSHOT=os.path.join(tmp_dir, "snapshot"),
+        POKEDEX_HISTORY_PATH=os.path.join(tmp_dir, "history.sqlite3"),
+        POKEDEX_RANKS_PATH=os.path.join(tmp_dir, "ranks.npz"),
+        POKEDEX_RESOURCE_CACHE_PATH=os.path.join(tmp_dir, "resources.sqlite3"),
+        POKEDEX_ARTWORK_DIR=os.path.join(tmp_dir, "artwork"),
+    )
+    return env
+
+
+def bench_cli(api, runs):
+    p1, p2 = api.roster[0], api.roster[1]
+    battle = ["pokemon.py", "battle", "-"]
+    lookup = ["pokemon.py", "lookup", "-"]
+    cold_battle, cold_lookup, warm_battle, warm_lookup = [], [], [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory(prefix="pokedex-bench-") as tmp_dir:
+            env = cli_env(api, tmp_dir)
+            cold_battle.append(run_python(battle, env, f"{p1},{p2}\n"))
+        with tempfile.TemporaryDirectory(prefix="pokedex-bench-") as tmp_dir:
+            env = cli_env(api, tmp_dir)
+            cold_lookup.append(run_python(lookup, env, f"{p1}\n"))
+        with tempfile.TemporaryDirectory(prefix="pokedex-bench-") as tmp_dir:
+            env = cli_env(api, tmp_dir)
+            run_python(["pokemon.py", "warmup", "--no-artwork", p1, p2], env)
+            warm_battle.append(run_python(battle, env, f"{p1},{p2}\n"))
+            warm_lookup.append(run_python(lookup, env, f"{p1}\n"))
+    for label, timings in (("CLI first battle, cold", cold_battle), ("CLI first battle, warmed up", warm_battle),
+                           ("CLI lookup, cold", cold_lookup), ("CLI lookup, warmed up", warm_lookup)):
+        print(f"{label:34} {statistics.median(timings) * 1000:8.1f} ms")
+
+
+def bench_render(api):
+    from streamlit.testing.v1 import AppTest
+
+    p1, p2 = api.roster[0], api.roster[1]
+
+    def first_battle():
+        at = AppTest.from_file(os.path.join(ROOT_DIR, "battle.py"), default_timeout=60)
+        at.session_state["show_comparison"] = True
+        at.session_state["p1"], at.session_state["p2"] = p1, p2
+        start = time.perf_counter()
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"battle page failed: {at.exception[0].message}")
+        return time.perf_counter() - start
+
+    with isolated(api, name_index=False):
+        cold = first_battle()
+    with isolated(api, name_index=False):
+        warmup.warm_up([p1, p2])
+        warm = first_battle()
+    print(f"{'battle page first render, cold':34} {cold * 1000:8.1f} ms")
+    print(f"{'battle page first render, warm':34} {warm * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.25, help="fake API latency per request in seconds")
+    parser.add_argument("--skip-render", action="store_true", help="skip the Streamlit AppTest benchmark")
+    args = parser.parse_args()
+
+    bench_imports(args.runs)
+    with FakePokeAPI(roster_size=50, latency=args.latency) as api:
+        bench_cli(api, args.runs)
+        if not args.skip_render:
+            bench_render(api)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import shutil
+import statistics
+import tempfile
+from contextlib import contextmanager
+
+import artwork
+import cache
+import history
+import names
+import ranks
+import resources
+import utils
+import warmup
+from circuit import CircuitBreaker
+from model import Pokemon
+
+
+@contextmanager
+def isolated(api, name_index=True):
+    """Point utils at a fake API with a fresh temporary cache, circuit breaker and no snapshot.
+
+    The name list, artwork, battle history, the rank index and linked
+    resources are kept in the temporary directory too. The name index is
+    preloaded from the fake roster (so it costs no request) unless
+    name_index is False.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="pokedex-bench-")
+    saved = (utils.POKEAPI_URL, utils.SNAPSHOT_PATH, cache._default_cache, names.NAMES_PATH, utils._name_index,
+             utils._breaker, artwork.ARTWORK_DIR, history._default_history, ranks.RANKS_PATH, ranks._index,
+             resources._cache, warmup.ENABLED)
+    utils.POKEAPI_URL = api.url
+    utils.SNAPSHOT_PATH = os.path.join(tmp_dir, "snapshot")
+    cache._default_cache = cache.ResponseCache(os.path.join(tmp_dir, "cache.sqlite3"),
+                                               dumps=Pokemon.dumps, loads=Pokemon.loads)
+    names.NAMES_PATH = os.path.join(tmp_dir, "names.json")
+    utils._name_index = names.NameIndex(api.roster) if name_index else None
+    utils._breaker = CircuitBreaker()
+    artwork.ARTWORK_DIR = os.path.join(tmp_dir, "artwork")
+    history._default_history = history.BattleHistory(os.path.join(tmp_dir, "history.sqlite3"))
+    ranks.RANKS_PATH, ranks._index = os.path.join(tmp_dir, "ranks.npz"), None
+    resources._cache = cache.ResponseCache(os.path.join(tmp_dir, "resources.sqlite3"))
+    # A page's background warm-up would outlive the temporary directory
+    warmup.ENABLED = False
+    try:
+        yield tmp_dir
+    finally:
+        history._default_history.close()
+        (utils.POKEAPI_URL, utils.SNAPSHOT_PATH, cache._default_cache, names.NAMES_PATH, utils._name_index,
+         utils._breaker, artwork.ARTWORK_DIR, history._default_history, ranks.RANKS_PATH, ranks._index,
+         resources._cache, warmup.ENABLED) = saved
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def percentiles(timings):
+    """Summary of a list of durations in seconds, in milliseconds."""
+    ordered = sorted(timings)
+    if not ordered:
+        return {}
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.mean(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
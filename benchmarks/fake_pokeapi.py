@@ -0,0 +1,454 @@
+"""A local fake PokeAPI for benchmarks.
+
+Serves deterministic /pokemon/{name} payloads (shaped like the real API,
+including a bulky moves list), the paginated /pokemon list, the linked
+/pokemon-species, /evolution-chain and /type resources and generated
+artwork PNGs, with configurable latency, jitter, error rate and rate limit.
+Start it in a background thread and point POKEAPI_URL (or utils.POKEAPI_URL)
+at `server.url`. AsyncFakePokeAPI serves the same routes from asyncio.
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from simulator import TYPE_CHART
+
+STAT_NAMES = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+TYPE_NAMES = [
+    "normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground",
+    "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy",
+]
+FIXTURE_NAMES = ["pikachu", "charizard", "lucario", "blastoise", "charmander", "swellow", "bulbasaur", "squirtle"]
+# Evolution lines among the fixture names; other fixtures stand alone, generated names come in threes
+FIXTURE_LINES = [["charmander", "charizard"], ["squirtle", "blastoise"]]
+RESOURCE_KINDS = ("pokemon-species", "evolution-chain", "type")
+REAL_API_URL = "https://pokeapi.co/api/v2"
+
+
+def make_roster(size: int):
+    """Fixture names first, then generated ones, `size` names in total."""
+    names = FIXTURE_NAMES[:size]
+    names += [f"pokemon-{i}" for i in range(len(names), size)]
+    return names
+
+
+def make_pokemon(name: str, pokemon_id: int, base_url: str) -> dict:
+    """Deterministic payload with the same shape as /api/v2/pokemon/{name}."""
+    rng = random.Random(name)
+    types = rng.sample(TYPE_NAMES, rng.choice([1, 2]))
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "base_experience": rng.randint(40, 300),
+        "height": rng.randint(2, 40),
+        "weight": rng.randint(20, 2000),
+        "types": [
+            {"slot": i + 1, "type": {"name": t, "url": f"{base_url}/type/{TYPE_NAMES.index(t) + 1}/"}}
+            for i, t in enumerate(types)
+        ],
+        "abilities": [
+            {"ability": {"name": f"ability-{rng.randint(1, 300)}", "url": ""}, "is_hidden": i == 1, "slot": i + 1}
+            for i in range(rng.choice([1, 2, 3]))
+        ],
+        "stats": [
+            {"base_stat": rng.randint(20, 160), "effort": 0, "stat": {"name": s, "url": ""}}
+            for s in STAT_NAMES
+        ],
+        "sprites": {
+            "front_default": f"{base_url}/sprites/{pokemon_id}.png",
+            "other": {"official-artwork": {"front_default": f"{base_url}/artwork/{pokemon_id}.png"}},
+        },
+        "species": {"name": name, "url": f"{base_url}/pokemon-species/{pokemon_id}/"},
+        # The real payload is dominated by moves and game indices
+        "moves": [
+            {"move": {"name": f"move-{m}", "url": ""},
+             "version_group_details": [{"level_learned_at": rng.randint(1, 100)} for _ in range(4)]}
+            for m in range(rng.randint(40, 120))
+        ],
+        "game_indices": [{"game_index": pokemon_id, "version": {"name": f"v{v}", "url": ""}} for v in range(20)],
+    }
+
+
+def make_lines(roster):
+    """Evolution lines (lists of names, first stage first) covering the whole roster."""
+    lines = [[name for name in line if name in roster] for line in FIXTURE_LINES]
+    lines = [line for line in lines if line]
+    grouped = {name for line in lines for name in line}
+    generated = []
+    for name in roster:
+        if name in grouped:
+            continue
+        if name in FIXTURE_NAMES:
+            lines.append([name])
+        else:
+            generated.append(name)
+    lines += [generated[i:i + 3] for i in range(0, len(generated), 3)]
+    return lines
+
+
+def make_species(name, pokemon_id, line, chain_id, base_url) -> dict:
+    """Payload shaped like /api/v2/pokemon-species/{id}."""
+    stage = line.index(name)
+    previous = line[stage - 1] if stage else None
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "evolves_from_species": {"name": previous, "url": f"{base_url}/pokemon-species/{previous}/"} if previous else None,
+        "evolution_chain": {"url": f"{base_url}/evolution-chain/{chain_id}/"},
+        "varieties": [{"is_default": True, "pokemon": {"name": name, "url": f"{base_url}/pokemon/{pokemon_id}/"}}],
+        # The real payload is dominated by flavor text in every language
+        "flavor_text_entries": [
+            {"flavor_text": f"{name} entry {i} " * 8, "language": {"name": "en", "url": ""}, "version": {"name": f"v{i}", "url": ""}}
+            for i in range(30)
+        ],
+    }
+
+
+def make_chain(line, chain_id, base_url) -> dict:
+    """Payload shaped like /api/v2/evolution-chain/{id}, one species per stage."""
+    node = None
+    for name in reversed(line):
+        node = {
+            "species": {"name": name, "url": f"{base_url}/pokemon-species/{name}/"},
+            "evolution_details": [{"min_level": 16, "trigger": {"name": "level-up", "url": ""}}] if node else [],
+            "evolves_to": [node] if node else [],
+        }
+    node["evolution_details"] = []
+    return {"id": chain_id, "baby_trigger_item": None, "chain": node}
+
+
+def make_type(type_name: str, base_url: str) -> dict:
+    """Payload shaped like /api/v2/type/{name}, with damage relations from the simulator's chart."""
+    row = TYPE_NAMES.index(type_name)
+
+    def named(indices):
+        return [{"name": TYPE_NAMES[i], "url": f"{base_url}/type/{i + 1}/"} for i in indices]
+
+    def matching(values, multiplier):
+        return [i for i, value in enumerate(values) if value == multiplier]
+
+    attacking, defending = TYPE_CHART[row], TYPE_CHART[:, row]
+    return {
+        "id": row + 1,
+        "name": type_name,
+        "damage_relations": {
+            "double_damage_to": named(matching(attacking, 2.0)),
+            "half_damage_to": named(matching(attacking, 0.5)),
+            "no_damage_to": named(matching(attacking, 0.0)),
+            "double_damage_from": named(matching(defending, 2.0)),
+            "half_damage_from": named(matching(defending, 0.5)),
+            "no_damage_from": named(matching(defending, 0.0)),
+        },
+    }
+
+
+def load_fixtures(directory: str) -> dict:
+    """Recorded payloads by name from a directory of {name}.json files."""
+    fixtures = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                fixtures[filename[:-5]] = json.load(f)
+    return fixtures
+
+
+def load_resource_fixtures(directory: str) -> dict:
+    """Recorded linked resources by (kind, key) from {kind}/{key}.json files."""
+    fixtures = {}
+    for kind in RESOURCE_KINDS:
+        kind_dir = os.path.join(directory, kind)
+        if os.path.isdir(kind_dir):
+            for key, payload in load_fixtures(kind_dir).items():
+                fixtures[(kind, key)] = payload
+    return fixtures
+
+
+class FakePokeAPI:
+    """Threaded HTTP server that imitates the parts of PokeAPI we call.
+
+    With rate_limit set, requests beyond that many per second (over a
+    sliding one-second window) get a 429 with Retry-After: 1. `fixtures` is
+    a directory of recorded /pokemon/{name} responses ({name}.json, see
+    record_fixtures.py); those names are served verbatim, with their
+    artwork pointed at the fake server. Recorded species, evolution chains
+    and types ({kind}/{key}.json) are served the same way, with their links
+    pointed at the fake server; missing ones are generated.
+    """
+
+    def __init__(self, roster_size=200, latency=0.0, jitter=0.0, error_rate=0.0, seed=0, rate_limit=None,
+                 fixtures=None):
+        self.fixtures = load_fixtures(fixtures) if fixtures else {}
+        self.resource_fixtures = load_resource_fixtures(fixtures) if fixtures else {}
+        self.roster = list(dict.fromkeys([*self.fixtures, *make_roster(roster_size)]))[:max(roster_size, len(self.fixtures))]
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.hits = 0
+        self.throttled = 0
+        self._window = deque()
+        self.paths = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = {name: i + 1 for i, name in enumerate(self.roster)}
+        self.lines = make_lines(self.roster)
+        self._line_of = {name: (chain_id, line) for chain_id, line in enumerate(self.lines, 1) for name in line}
+        self._bodies = {}
+        self._thread = None
+        self._server = self._make_server()
+
+    def _make_server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        server.daemon_threads = True
+        return server
+
+    @property
+    def port(self) -> int:
+        return self._server.server_port
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/api/v2"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def pokemon_body(self, name: str) -> bytes:
+        with self._lock:
+            body = self._bodies.get(name)
+            if body is None:
+                payload = self.fixtures.get(name) or make_pokemon(name, self._ids[name], self.url)
+                if name in self.fixtures:
+                    artwork = payload.get("sprites", {}).get("other", {}).get("official-artwork", {})
+                    if artwork.get("front_default"):
+                        artwork["front_default"] = f"{self.url}/artwork/{self._ids[name]}.png"
+                body = json.dumps(payload).encode()
+                self._bodies[name] = body
+            return body
+
+    def resource_body(self, kind: str, key: str):
+        """Body of a linked resource by id or name, or None if there is no such resource."""
+        with self._lock:
+            body = self._bodies.get((kind, key))
+        if body is not None:
+            return body
+        if (kind, key) in self.resource_fixtures:
+            body = json.dumps(self.resource_fixtures[(kind, key)]).replace(REAL_API_URL, self.url).encode()
+        elif kind == "pokemon-species":
+            name = self.roster[int(key) - 1] if key.isdigit() and 0 < int(key) <= len(self.roster) else key
+            if name not in self._ids:
+                return None
+            chain_id, line = self._line_of[name]
+            body = json.dumps(make_species(name, self._ids[name], line, chain_id, self.url)).encode()
+        elif kind == "evolution-chain":
+            if not (key.isdigit() and 0 < int(key) <= len(self.lines)):
+                return None
+            body = json.dumps(make_chain(self.lines[int(key) - 1], int(key), self.url)).encode()
+        elif kind == "type":
+            name = TYPE_NAMES[int(key) - 1] if key.isdigit() and 0 < int(key) <= len(TYPE_NAMES) else key
+            if name not in TYPE_NAMES:
+                return None
+            body = json.dumps(make_type(name, self.url)).encode()
+        else:
+            return None
+        with self._lock:
+            self._bodies[(kind, key)] = body
+        return body
+
+    def artwork_body(self, pokemon_id: int, size=475) -> bytes:
+        """A full-size, noisy PNG standing in for the official artwork."""
+        from io import BytesIO
+
+        from PIL import Image
+
+        key = ("artwork", pokemon_id)
+        with self._lock:
+            body = self._bodies.get(key)
+        if body is None:
+            rng = random.Random(pokemon_id)
+            image = Image.frombytes("RGBA", (size, size), rng.randbytes(size * size * 4))
+            buffer = BytesIO()
+            image.save(buffer, "PNG")
+            body = buffer.getvalue()
+            with self._lock:
+                self._bodies[key] = body
+        return body
+
+    def _over_limit(self) -> bool:
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.rate_limit:
+                self.throttled += 1
+                return True
+            self._window.append(now)
+            return False
+
+    def _begin(self, path: str):
+        """Count a request and draw its fate: (delay in seconds, fail with 503, throttle with 429)."""
+        with self._lock:
+            self.hits += 1
+            self.paths.append(path)
+        if self._over_limit():
+            return 0.0, False, True
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate and self._rng.random() < self.error_rate
+        return delay, fail, False
+
+    def respond(self, path: str, fail=False, throttled=False, if_none_match=None):
+        """Return (status, headers, body) for a GET once its delay has passed."""
+        if throttled:
+            return 429, {"Retry-After": "1"}, b"Too Many Requests"
+        if fail:
+            return 503, {"Retry-After": "0"}, b"Service Unavailable"
+        parsed = urlparse(path)
+        status, headers, body = self.route(parsed.path, parse_qs(parsed.query))
+        etag = headers.get("ETag")
+        if etag and if_none_match == etag:
+            return 304, headers, b""
+        return status, headers, body
+
+    def route(self, path: str, query: dict):
+        """Return (status, headers, body) for a GET request."""
+        parts = [p for p in path.split("/") if p][2:]  # drop "api", "v2"
+        if parts == ["pokemon"]:
+            limit = int(query.get("limit", ["20"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            page = self.roster[offset:offset + limit]
+            nxt = f"{self.url}/pokemon?offset={offset + limit}&limit={limit}" if offset + limit < len(self.roster) else None
+            return 200, {}, json.dumps({
+                "count": len(self.roster),
+                "next": nxt,
+                "results": [{"name": n, "url": f"{self.url}/pokemon/{self._ids[n]}/"} for n in page],
+            }).encode()
+        if len(parts) == 2 and parts[0] == "pokemon":
+            key = parts[1]
+            name = self.roster[int(key) - 1] if key.isdigit() and 0 < int(key) <= len(self.roster) else key
+            if name not in self._ids:
+                return 404, {}, b"Not Found"
+            return 200, {"ETag": f'"{name}-v1"'}, self.pokemon_body(name)
+        if len(parts) == 2 and parts[0] in RESOURCE_KINDS:
+            body = self.resource_body(parts[0], parts[1])
+            if body is not None:
+                return 200, {"ETag": f'"{parts[0]}-{parts[1]}-v1"'}, body
+            return 404, {}, b"Not Found"
+        if len(parts) == 2 and parts[0] in ("artwork", "sprites") and parts[1].endswith(".png"):
+            pokemon_id = parts[1][:-4]
+            if pokemon_id.isdigit() and 0 < int(pokemon_id) <= len(self.roster):
+                return 200, {"Content-Type": "image/png"}, self.artwork_body(int(pokemon_id))
+        return 404, {}, b"Not Found"
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                delay, fail, throttled = api._begin(self.path)
+                if delay > 0:
+                    time.sleep(delay)
+                self._send(*api.respond(self.path, fail, throttled, self.headers.get("If-None-Match")))
+
+            def _send(self, status, headers, body):
+                self.send_response(status)
+                headers = {"Content-Type": "application/json", **headers}
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+class AsyncFakePokeAPI(FakePokeAPI):
+    """The same fake API served by asyncio on its own loop thread.
+
+    Slow requests wait in asyncio.sleep instead of holding a thread each, so
+    hundreds of concurrent connections stay cheap for the server side.
+    """
+
+    def _make_server(self):
+        self._connections = set()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        start = asyncio.start_server(self._serve, "127.0.0.1", 0, backlog=1024)
+        return asyncio.run_coroutine_threadsafe(start, self._loop).result()
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    def start(self):
+        return self
+
+    def stop(self):
+        async def shutdown():
+            self._server.close()
+            # Idle keep-alive connections would otherwise keep their handlers waiting forever
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+
+    async def _serve(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                path = request_line.decode("latin-1").split(" ")[1]
+                headers = {}
+                while (line := (await reader.readline()).decode("latin-1").rstrip("\r\n")):
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                delay, fail, throttled = self._begin(path)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                status, extra, body = self.respond(path, fail, throttled, headers.get("if-none-match"))
+                head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+                head += [f"{k}: {v}" for k, v in {"Content-Type": "application/json", **extra}.items()]
+                head.append(f"Content-Length: {len(body)}")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
@@ -0,0 +1,87 @@
+"""Record real PokeAPI responses as fixtures for the fake API.
+
+    python -m benchmarks.record_fixtures [--out benchmarks/fixtures] [--graph] [names ...]
+
+Saves /pokemon/{name} responses as {name}.json. With --graph it also saves
+each Pokemon's species, evolution chain and types, plus every other member
+of the chain, under {kind}/{key}.json. Start the fake API with
+FakePokeAPI(fixtures=...) (or `suite.py --fixtures`) to serve them instead
+of generated payloads, so payload sizes and parsing costs are realistic.
+"""
+import argparse
+import json
+import os
+
+import client
+import resources
+import utils
+from benchmarks.fake_pokeapi import FIXTURE_NAMES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fetch(url):
+    response = client.get(url)
+    response.raise_for_status()
+    return response
+
+
+def save(path, response):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(response.json(), f)
+    print(f"{path}: {len(response.content):,} bytes")
+
+
+def record_graph(out, payload, saved):
+    """Save the species, evolution chain and types linked from a /pokemon payload.
+
+    Returns the Pokemon of every species seen, so the chain's other members can be recorded too.
+    """
+    urls = [payload["species"]["url"], *(t["type"]["url"] for t in payload["types"])]
+    members = []
+    while urls:
+        url = urls.pop(0)
+        kind, key = resources.split_url(url)
+        response = fetch(url)
+        data = response.json()
+        # Saved under the key our client asks for: species and types by name, chains by id
+        key = data["name"] if kind in ("pokemon-species", "type") else key
+        if (kind, key) in saved:
+            continue
+        saved.add((kind, key))
+        save(os.path.join(out, kind, f"{key}.json"), response)
+        if kind == "pokemon-species":
+            members.append(resources._project_species(data)["pokemon"])
+            if data.get("evolution_chain"):
+                urls.append(data["evolution_chain"]["url"])
+        elif kind == "evolution-chain":
+            for species, _, _ in resources.chain_members(resources._project_chain(data)):
+                if ("pokemon-species", species) not in saved:
+                    urls.append(resources.resource_url("pokemon-species", species))
+    return members
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", default=FIXTURE_NAMES)
+    parser.add_argument("--out", default=FIXTURES_DIR)
+    parser.add_argument("--graph", action="store_true", help="also record species, evolution chains and types")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    queue = [utils.normalize_name(name) for name in args.names]
+    recorded, saved = set(), set()
+    while queue:
+        name = queue.pop(0)
+        if name in recorded:
+            continue
+        recorded.add(name)
+        response = fetch(f"{utils.POKEAPI_URL}/pokemon/{name}")
+        save(os.path.join(args.out, f"{name}.json"), response)
+        if args.graph:
+            queue += record_graph(args.out, response.json(), saved)
+
+
+if __name__ == "__main__":
+    main()
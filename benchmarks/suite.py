@@ -0,0 +1,225 @@
+"""The benchmark suite: one reproducible run, saved as JSON for comparison.
+
+    python -m benchmarks.suite [--latency 0.05] [--jitter 0.02] [--error-rate 0]
+                               [--fixtures benchmarks/fixtures] [--skip-render]
+                               [--out results.json] [--compare baseline.json]
+
+Against a local fake API (generated payloads, or recorded ones with
+--fixtures) it measures:
+
+* cold and warm get_pokemon_data latency percentiles (warm from memory and
+  from the on-disk cache),
+* lookup throughput with 1, 8 and 32 threads,
+* memory and disk bytes per cached entry,
+* pokemon.compare_pokemons end to end, cold and warm,
+* the battle page render time through Streamlit's AppTest, cold and warm.
+
+The client-side rate limit is lifted for the fake API, so the numbers
+reflect our code rather than the request budget. Results go to
+benchmarks/results/<timestamp>.json unless --out is given. With --compare,
+metrics that got worse than --threshold (default 20%) are listed and the
+exit status is 1.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import cache
+import pokemon
+import ratelimit
+import utils
+from benchmarks.common import isolated, percentiles
+from benchmarks.fake_pokeapi import FakePokeAPI
+from model import Pokemon
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def bench_lookups(api, count):
+    names = api.roster[:count]
+    with isolated(api) as tmp_dir:
+        cold = [timed(utils.get_pokemon_data, name) for name in names]
+        warm_memory = [timed(utils.get_pokemon_data, name) for name in names]
+        # A new cache object over the same file: memory LRU empty, disk warm
+        cache._default_cache = cache.ResponseCache(os.path.join(tmp_dir, "cache.sqlite3"),
+                                                   dumps=Pokemon.dumps, loads=Pokemon.loads)
+        warm_disk = [timed(utils.get_pokemon_data, name) for name in names]
+    return {"cold": percentiles(cold), "warm_memory": percentiles(warm_memory), "warm_disk": percentiles(warm_disk)}
+
+
+def bench_throughput(api, count, thread_counts=(1, 8, 32)):
+    results = {}
+    for threads in thread_counts:
+        with isolated(api), ThreadPoolExecutor(max_workers=threads) as pool:
+            start = time.perf_counter()
+            ok = sum(result.ok for result in pool.map(utils.lookup, api.roster[:count]))
+            elapsed = time.perf_counter() - start
+        results[f"threads_{threads}"] = {"ok": ok, "seconds": elapsed, "lookups_per_second": count / elapsed}
+    return results
+
+
+def bench_memory(api, count):
+    payloads = [json.loads(api.pokemon_body(name)) for name in api.roster[:count]]
+    with tempfile.TemporaryDirectory(prefix="pokedex-bench-") as tmp_dir:
+        path = os.path.join(tmp_dir, "cache.sqlite3")
+        response_cache = cache.ResponseCache(path, memory_entries=count, max_entries=count,
+                                             dumps=Pokemon.dumps, loads=Pokemon.loads)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for payload in payloads:
+            response_cache.put(payload["name"], Pokemon.from_api(payload), etag=f'"{payload["name"]}"')
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        disk = os.path.getsize(path)
+    return {"entries": count, "memory_bytes_per_entry": (after - before) / count,
+            "disk_bytes_per_entry": disk / count}
+
+
+def bench_compare(api, rounds):
+    pairs = list(zip(api.roster[:rounds], api.roster[rounds:rounds * 2]))
+    with isolated(api), contextlib.redirect_stdout(io.StringIO()):
+        cold = [timed(pokemon.compare_pokemons, p1, p2) for p1, p2 in pairs]
+        warm = [timed(pokemon.compare_pokemons, p1, p2) for p1, p2 in pairs]
+    return {"cold": percentiles(cold), "warm": percentiles(warm)}
+
+
+def bench_render(api, rounds):
+    from streamlit.testing.v1 import AppTest
+
+    def render(at):
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"battle page failed: {at.exception[0].message}")
+        return elapsed
+
+    cold, warm = [], []
+    with isolated(api):
+        for p1, p2 in zip(api.roster[:rounds], api.roster[rounds:rounds * 2]):
+            at = AppTest.from_file(os.path.join(ROOT_DIR, "battle.py"), default_timeout=60)
+            at.session_state["show_comparison"] = True
+            at.session_state["p1"], at.session_state["p2"] = p1, p2
+            cold.append(render(at))
+            warm.append(render(at))
+    # Every battle render includes the fixed 1.6 s READY/FIGHT intro
+    return {"cold": percentiles(cold), "warm": percentiles(warm)}
+
+
+def environment(args) -> dict:
+    import numpy
+    import streamlit
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": numpy.__version__,
+        "streamlit": streamlit.__version__,
+        "args": vars(args),
+    }
+
+
+def flatten(results, prefix=""):
+    """{"a": {"b": 1}} -> {"a.b": 1}, numbers only."""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def regressions(baseline, current, threshold):
+    """(metric, old, new, change) for every metric that got worse by more than threshold."""
+    old, new = flatten(baseline["results"]), flatten(current["results"])
+    worse = []
+    for key in sorted(old.keys() & new.keys()):
+        # Tail samples are too noisy for a fixed threshold
+        if key.endswith((".count", ".entries", ".ok", ".max_ms", ".p99_ms")) or not old[key]:
+            continue
+        change = (new[key] - old[key]) / old[key]
+        higher_is_better = key.endswith("per_second")
+        if (-change if higher_is_better else change) > threshold:
+            worse.append((key, old[key], new[key], change))
+    return worse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="fake API think time in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", help="directory of recorded responses (see record_fixtures.py)")
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--entries", type=int, default=1000, help="cache entries for the memory benchmark")
+    parser.add_argument("--battles", type=int, default=5)
+    parser.add_argument("--skip-render", action="store_true", help="skip the Streamlit AppTest benchmark")
+    parser.add_argument("--out", help="where to save the results (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    run = {"environment": environment(args), "results": {}}
+    results = run["results"]
+    with FakePokeAPI(roster_size=max(args.entries, args.lookups, args.battles * 2), latency=args.latency,
+                     jitter=args.jitter, error_rate=args.error_rate, fixtures=args.fixtures) as api:
+        ratelimit.configure(api.url, rate=0, initial=32, maximum=32)
+        steps = [
+            ("lookup", lambda: bench_lookups(api, args.lookups)),
+            ("throughput", lambda: bench_throughput(api, args.lookups)),
+            ("memory", lambda: bench_memory(api, args.entries)),
+            ("compare_pokemons", lambda: bench_compare(api, args.battles)),
+        ]
+        if not args.skip_render:
+            steps.append(("battle_render", lambda: bench_render(api, args.battles)))
+        for name, step in steps:
+            start = time.perf_counter()
+            results[name] = step()
+            print(f"{name:18} done in {time.perf_counter() - start:6.2f} s", file=sys.stderr)
+
+    for key, value in flatten(results).items():
+        print(f"{key:45} {value:14,.3f}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{run['environment']['timestamp'].replace(':', '')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nSaved to {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        worse = regressions(baseline, run, args.threshold)
+        for key, old, new, change in worse:
+            print(f"REGRESSION {key}: {old:,.3f} -> {new:,.3f} ({change:+.0%})")
+        if worse:
+            sys.exit(1)
+        print(f"No regressions over {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
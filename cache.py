@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+from model import Pokemon
+
+# Cache settings (override with environment variables)
+CACHE_PATH = os.environ.get("POKEDEX_CACHE_PATH", ".pokedex_cache.sqlite3")
+CACHE_TTL = float(os.environ.get("POKEDEX_CACHE_TTL", 7 * 24 * 3600))
+NEGATIVE_TTL = float(os.environ.get("POKEDEX_NEGATIVE_TTL", 3600))
+MAX_ENTRIES = int(os.environ.get("POKEDEX_CACHE_MAX_ENTRIES", 2000))
+MEMORY_ENTRIES = int(os.environ.get("POKEDEX_CACHE_MEMORY_ENTRIES", 256))
+# Reads update accessed_at on disk in batches, at most this often (and before any eviction)
+TOUCH_INTERVAL = float(os.environ.get("POKEDEX_CACHE_TOUCH_INTERVAL", 5))
+
+
+class CacheEntry:
+    """One cached API response (status 200 with data, or a remembered 404)."""
+    __slots__ = ("status", "data", "etag", "last_modified", "expires_at")
+
+    def __init__(self, status, data, etag=None, last_modified=None, expires_at=0.0):
+        self.status = status
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self, now=None):
+        return (now or time.time()) < self.expires_at
+
+    def validators(self):
+        """Headers for a conditional request, so the API can answer 304."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL, negative caching and LRU eviction.
+
+    Decoded entries are also kept in a small in-memory LRU so warm lookups
+    never touch the disk. Their recency still reaches the disk LRU: reads
+    are noted and written to accessed_at in batches, so the hottest entries
+    aren't the first evicted.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, negative_ttl=NEGATIVE_TTL,
+                 max_entries=MAX_ENTRIES, memory_entries=MEMORY_ENTRIES, dumps=None, loads=None):
+        self.path = path
+        self.dumps = dumps or (lambda data: json.dumps(data, separators=(",", ":")))
+        self.loads = loads or json.loads
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._touched = {}
+        self._touches_written = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                body TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the CacheEntry for key (fresh or stale), or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._touch(key)
+                return entry
+
+            row = self._conn.execute(
+                "SELECT status, body, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touch(key)
+
+            status, body, etag, last_modified, expires_at = row
+            with metrics.timer("pokedex_decode_seconds", source="cache"):
+                data = self.loads(body) if body is not None else None
+            entry = CacheEntry(status, data, etag, last_modified, expires_at)
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key, data, etag=None, last_modified=None):
+        """Store a successful response."""
+        entry = CacheEntry(200, data, etag, last_modified, time.time() + self.ttl)
+        self._store(key, entry, self.dumps(data))
+        return entry
+
+    def put_missing(self, key):
+        """Remember that key does not exist (404) for the negative TTL."""
+        entry = CacheEntry(404, None, expires_at=time.time() + self.negative_ttl)
+        self._store(key, entry, None)
+        return entry
+
+    def refresh(self, key, entry):
+        """Extend a stale entry after the API confirmed it unchanged (304)."""
+        entry.expires_at = time.time() + (self.ttl if entry.status == 200 else self.negative_ttl)
+        with self._lock:
+            self._conn.execute("UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                               (entry.expires_at, time.time(), key))
+            self._conn.commit()
+            self._remember(key, entry)
+        return entry
+
+    def values(self):
+        """Decoded data of every cached success on disk (fresh or stale)."""
+        with self._lock:
+            bodies = [body for body, in self._conn.execute("SELECT body FROM responses WHERE status = 200")]
+        return [self.loads(body) for body in bodies]
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _store(self, key, entry, body):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.status, body, entry.etag, entry.last_modified, entry.expires_at, now)
+            )
+            self._touched.pop(key, None)
+            self._write_touches()
+            self._evict()
+            self._conn.commit()
+            self._remember(key, entry)
+
+    def _touch(self, key):
+        # Called with the lock held
+        self._touched[key] = time.time()
+        if time.monotonic() - self._touches_written >= TOUCH_INTERVAL:
+            self._write_touches()
+            self._conn.commit()
+
+    def _write_touches(self):
+        if self._touched:
+            self._conn.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?",
+                                   [(at, key) for key, at in self._touched.items()])
+            self._touched.clear()
+        self._touches_written = time.monotonic()
+
+    def _evict(self):
+        # Drop the least recently used rows once we go over the size cap
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide Pokemon cache shared by the CLI and both Streamlit apps."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(dumps=Pokemon.dumps, loads=Pokemon.loads)
+        return _default_cache
@@ -0,0 +1,76 @@
+"""Circuit breaker for the upstream API.
+
+After `failure_threshold` consecutive failures (connection errors, timeouts,
+429/5xx after retries) the breaker opens and callers stop waiting on the
+API: they get cached data or fail fast. Once `reset_timeout` seconds have
+passed, one probe request is let through ("half-open"); if it succeeds the
+breaker closes again, otherwise it stays open for another timeout.
+"""
+import os
+import threading
+import time
+
+FAILURE_THRESHOLD = int(os.environ.get("POKEAPI_BREAKER_FAILURES", 5))
+RESET_TIMEOUT = float(os.environ.get("POKEAPI_BREAKER_RESET", 30))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream that is known to be down."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 unless open)."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a request may go out now. In half-open state only one probe at a time may."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._state = CLOSED
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def check(self, what="the upstream API"):
+        """allow(), raising CircuitOpenError when the request may not go out."""
+        if not self.allow():
+            raise CircuitOpenError(f"{what} is unavailable; retrying in {self.retry_in():.0f} s")
@@ -0,0 +1,130 @@
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import metrics
+import ratelimit
+
+if TYPE_CHECKING:
+    import requests
+
+# HTTP client settings (override with environment variables)
+POOL_SIZE = int(os.environ.get("POKEAPI_POOL_SIZE", 10))
+CONNECT_TIMEOUT = float(os.environ.get("POKEAPI_CONNECT_TIMEOUT", 3.05))
+READ_TIMEOUT = float(os.environ.get("POKEAPI_READ_TIMEOUT", 5))
+MAX_RETRIES = int(os.environ.get("POKEAPI_MAX_RETRIES", 3))
+BACKOFF_BASE = float(os.environ.get("POKEAPI_BACKOFF_BASE", 0.25))
+BACKOFF_MAX = float(os.environ.get("POKEAPI_BACKOFF_MAX", 8))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    """Shared keep-alive session, so lookups reuse pooled connections.
+
+    requests is imported here, on the first request, so that lookups served
+    from the cache start without it.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = "pokemon-battle-arena"
+            _session = session
+        return _session
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def request_errors():
+    """The exception types a failed request raises, for except clauses."""
+    import requests
+    return (requests.exceptions.RequestException,)
+
+
+def retry_after_seconds(response):
+    """Parse a Retry-After header (seconds or HTTP date), or None if absent."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def record_metrics(status: int, size: int, seconds: float):
+    metrics.observe("pokeapi_request_seconds", seconds)
+    metrics.inc("pokeapi_requests_total", status=status)
+    metrics.inc("pokeapi_response_bytes_total", size)
+
+
+def get(url: str, headers=None, timeout=None, retries=None) -> "requests.Response":
+    """GET through the pooled session, retrying 429/5xx and connection errors.
+
+    Every attempt first waits for the host's rate limiter (see ratelimit.py).
+
+    Retry-After is honored (capped at BACKOFF_MAX). The last response is
+    returned once retries run out; the last exception is raised if every
+    attempt failed to connect. Other request errors are raised straight away.
+    """
+    import requests
+
+    session = get_session()
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    retries = MAX_RETRIES if retries is None else retries
+    limiter = ratelimit.limiter_for(url)
+    for attempt in range(retries + 1):
+        started = limiter.acquire()
+        response = None
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            metrics.inc("pokeapi_requests_total", status=type(e).__name__)
+            retryable = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+            if attempt == retries or not retryable:
+                raise
+        finally:
+            # Whatever happened, the slot goes back before any backoff sleep
+            if response is None:
+                limiter.release(started, failed=True)
+            else:
+                limiter.release(started, response.status_code)
+        if response is None:
+            time.sleep(backoff_delay(attempt))
+            continue
+        if metrics.ENABLED:
+            record_metrics(response.status_code, len(response.content), time.monotonic() - started)
+
+        if response.status_code not in RETRY_STATUSES or attempt == retries:
+            return response
+        delay = retry_after_seconds(response)
+        response.close()
+        time.sleep(min(BACKOFF_MAX, delay) if delay is not None else backoff_delay(attempt))
@@ -0,0 +1,274 @@
+"""Battle history and leaderboard, kept in a local SQLite database.
+
+Every battle is appended to the `battles` table. Per-Pokemon totals,
+head-to-head records and per-day counts are updated in the same
+transaction, so leaderboard and head-to-head reads touch a few indexed rows
+whatever the length of the history. Writes are queued and committed in
+batches by a background thread, so recording a battle never waits on the
+disk; the database runs in WAL mode, so reads don't wait on the writer either.
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+HISTORY_PATH = os.environ.get("POKEDEX_HISTORY_PATH", ".pokedex_history.sqlite3")
+# The writer commits once it has this many battles, or after this many seconds
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.5
+# The CLI and the Streamlit server share the file: wait this long (ms) for the other's lock,
+# and retry a batch this many times before giving up on it
+BUSY_TIMEOUT = 5000
+WRITE_ATTEMPTS = 3
+
+DAY = 24 * 3600
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS battles (
+        id INTEGER PRIMARY KEY,
+        at REAL NOT NULL,
+        p1 TEXT NOT NULL,
+        p2 TEXT NOT NULL,
+        total1 INTEGER NOT NULL,
+        total2 INTEGER NOT NULL,
+        winner TEXT,
+        source TEXT
+    );
+    CREATE INDEX IF NOT EXISTS battles_at ON battles (at);
+
+    CREATE TABLE IF NOT EXISTS pokemon_stats (
+        name TEXT PRIMARY KEY,
+        battles INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        losses INTEGER NOT NULL,
+        ties INTEGER NOT NULL,
+        last_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS pokemon_stats_wins ON pokemon_stats (wins DESC);
+
+    CREATE TABLE IF NOT EXISTS pokemon_daily (
+        day INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        battles INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        losses INTEGER NOT NULL,
+        ties INTEGER NOT NULL,
+        PRIMARY KEY (day, name)
+    );
+
+    CREATE TABLE IF NOT EXISTS head_to_head (
+        a TEXT NOT NULL,
+        b TEXT NOT NULL,
+        a_wins INTEGER NOT NULL,
+        b_wins INTEGER NOT NULL,
+        ties INTEGER NOT NULL,
+        PRIMARY KEY (a, b)
+    );
+"""
+
+_UPSERT_STATS = """
+    INSERT INTO pokemon_stats (name, battles, wins, losses, ties, last_at) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (name) DO UPDATE SET
+        battles = battles + excluded.battles, wins = wins + excluded.wins, losses = losses + excluded.losses,
+        ties = ties + excluded.ties, last_at = MAX(last_at, excluded.last_at)
+"""
+_UPSERT_DAILY = """
+    INSERT INTO pokemon_daily (day, name, battles, wins, losses, ties) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (day, name) DO UPDATE SET
+        battles = battles + excluded.battles, wins = wins + excluded.wins, losses = losses + excluded.losses,
+        ties = ties + excluded.ties
+"""
+_UPSERT_HEAD_TO_HEAD = """
+    INSERT INTO head_to_head (a, b, a_wins, b_wins, ties) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (a, b) DO UPDATE SET
+        a_wins = a_wins + excluded.a_wins, b_wins = b_wins + excluded.b_wins, ties = ties + excluded.ties
+"""
+
+_STOP = object()
+
+
+def _winner(p1, p2, total1, total2):
+    # Same rule as the arena: the higher base-stat total wins
+    return p1 if total1 > total2 else p2 if total2 > total1 else None
+
+
+class BattleHistory:
+    """Append-only battle log with incrementally maintained aggregates.
+
+    record() only queues the battle; call flush() to wait until everything
+    queued so far is committed.
+    """
+
+    def __init__(self, path=HISTORY_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._write_conn = sqlite3.connect(path, check_same_thread=False)
+        self._write_conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT}")
+        self._write_conn.execute("PRAGMA journal_mode=WAL")
+        self._write_conn.execute("PRAGMA synchronous=NORMAL")
+        self._write_conn.executescript(SCHEMA)
+        self._write_conn.commit()
+        self._read_conn = sqlite3.connect(path, check_same_thread=False)
+        self._read_conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT}")
+        self._read_lock = threading.Lock()
+
+    def record(self, p1: str, p2: str, total1: int, total2: int, source=None, at=None):
+        """Queue one battle; the winner follows from the totals."""
+        self._queue.put((at or time.time(), p1, p2, int(total1), int(total2),
+                         _winner(p1, p2, total1, total2), source))
+        self._ensure_writer()
+
+    def flush(self):
+        """Block until every queued battle is committed."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        with self._writer_lock:
+            if self._writer is not None:
+                self._queue.put(_STOP)
+                self._writer.join()
+                self._writer = None
+        self._write_conn.close()
+        self._read_conn.close()
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            with self._writer_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._write_loop, daemon=True, name="pokedex-history")
+                    self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            battles = batch[:-1] if stop else batch
+            try:
+                if battles:
+                    self._write_batch(battles)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, battles):
+        # A failed batch must not take the writer thread down with it: later battles would pile up unsaved
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                self._write(battles)
+                return
+            except sqlite3.OperationalError as e:
+                error = e  # usually "database is locked" by the other process
+                if attempt < WRITE_ATTEMPTS:
+                    time.sleep(self.flush_interval * attempt)
+            except Exception as e:
+                error = e
+                break
+        print(f"Could not save {len(battles)} battles to the history: {error}")
+
+    def _write(self, battles):
+        # Sum the batch up first: one upsert per Pokemon, day and pairing
+        stats, daily, head_to_head = {}, {}, {}
+        for at, p1, p2, _, _, winner, _ in battles:
+            day = int(at // DAY)
+            for name in (p1, p2):
+                outcome = (1, 0, 0) if winner == name else (0, 0, 1) if winner is None else (0, 1, 0)
+                row = stats.setdefault(name, [0, 0, 0, 0, 0.0])
+                row[0] += 1
+                row[1] += outcome[0]
+                row[2] += outcome[1]
+                row[3] += outcome[2]
+                row[4] = max(row[4], at)
+                row = daily.setdefault((day, name), [0, 0, 0, 0])
+                row[0] += 1
+                row[1] += outcome[0]
+                row[2] += outcome[1]
+                row[3] += outcome[2]
+            a, b = sorted((p1, p2))
+            row = head_to_head.setdefault((a, b), [0, 0, 0])
+            row[0 if winner == a else 1 if winner == b else 2] += 1
+
+        with self._write_conn:
+            self._write_conn.executemany(
+                "INSERT INTO battles (at, p1, p2, total1, total2, winner, source) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                battles)
+            self._write_conn.executemany(_UPSERT_STATS, [(name, *row) for name, row in stats.items()])
+            self._write_conn.executemany(_UPSERT_DAILY, [(*key, *row) for key, row in daily.items()])
+            self._write_conn.executemany(_UPSERT_HEAD_TO_HEAD, [(*key, *row) for key, row in head_to_head.items()])
+
+    def _query(self, sql, params=()):
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def leaderboard(self, k=10, by="wins", days=None, min_battles=1):
+        """Rows of (rank, name, battles, wins, losses, ties, win_rate), best first.
+
+        by is "wins" or "win_rate"; days limits it to the last N calendar
+        days (UTC), today included.
+        """
+        order = {"wins": "wins DESC, battles ASC", "win_rate": "CAST(wins AS REAL) / battles DESC, wins DESC"}[by]
+        if days is None:
+            rows = self._query(
+                f"SELECT name, battles, wins, losses, ties FROM pokemon_stats WHERE battles >= ? "
+                f"ORDER BY {order}, name LIMIT ?", (min_battles, k))
+        else:
+            rows = self._query(
+                f"SELECT name, SUM(battles) AS battles, SUM(wins) AS wins, SUM(losses), SUM(ties) "
+                f"FROM pokemon_daily WHERE day > ? GROUP BY name HAVING battles >= ? "
+                f"ORDER BY {order}, name LIMIT ?", (int(time.time() // DAY) - days, min_battles, k))
+        return [(rank, name, battles, wins, losses, ties, round(wins / battles, 4))
+                for rank, (name, battles, wins, losses, ties) in enumerate(rows, 1)]
+
+    def record_for(self, name: str):
+        """(battles, wins, losses, ties) for one Pokemon, all time."""
+        rows = self._query("SELECT battles, wins, losses, ties FROM pokemon_stats WHERE name = ?", (name,))
+        return rows[0] if rows else (0, 0, 0, 0)
+
+    def head_to_head(self, p1: str, p2: str):
+        """(p1 wins, p2 wins, ties) over every battle between the two."""
+        a, b = sorted((p1, p2))
+        rows = self._query("SELECT a_wins, b_wins, ties FROM head_to_head WHERE a = ? AND b = ?", (a, b))
+        a_wins, b_wins, ties = rows[0] if rows else (0, 0, 0)
+        return (a_wins, b_wins, ties) if a == p1 else (b_wins, a_wins, ties)
+
+    def recent(self, limit=20, since=None):
+        """The latest battles as (at, p1, p2, total1, total2, winner), newest first."""
+        return self._query(
+            "SELECT at, p1, p2, total1, total2, winner FROM battles WHERE at >= ? ORDER BY at DESC LIMIT ?",
+            (since or 0, limit))
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM battles")[0][0]
+
+
+_default_history = None
+_default_lock = threading.Lock()
+
+
+def get_history():
+    """Process-wide battle history shared by the CLI and the Streamlit pages."""
+    global _default_history
+    with _default_lock:
+        if _default_history is None:
+            _default_history = BattleHistory()
+            atexit.register(_default_history.flush)
+        return _default_history
+
+
+def record(p1: str, p2: str, total1: int, total2: int, source=None):
+    """Queue a battle in the default history without blocking the caller."""
+    get_history().record(p1, p2, total1, total2, source=source)
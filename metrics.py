@@ -0,0 +1,222 @@
+"""In-process counters and latency histograms, exported in Prometheus text format.
+
+Off by default; POKEDEX_METRICS=1 (or metrics.enable()) turns it on. While
+disabled every call returns after one global check, so the hooks can stay
+in the hot paths:
+
+    metrics.inc("pokedex_cache_lookups_total", result="hit")
+    with metrics.timer("pokedex_render_seconds", component="card"):
+        ...
+
+Read the numbers with render() (Prometheus text), write_file(path), or
+serve(port) for a /metrics endpoint on a background thread
+(POKEDEX_METRICS_PORT starts one at import).
+"""
+import bisect
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+ENABLED = os.environ.get("POKEDEX_METRICS", "") not in ("", "0")
+# Set to serve /metrics on this port as soon as the module is imported (implies ENABLED)
+PORT = int(os.environ.get("POKEDEX_METRICS_PORT", 0))
+
+# Upper bounds in seconds, from cache hits to slow upstream calls
+BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "pokeapi_request_seconds": "Upstream HTTP request latency, per attempt",
+    "pokeapi_requests_total": "Upstream HTTP requests by status (or error)",
+    "pokeapi_response_bytes_total": "Upstream response body bytes received",
+    "pokedex_cache_lookups_total": "Pokemon lookups by where the answer came from",
+    "pokedex_decode_seconds": "Time to parse a Pokemon from an API payload or the disk cache",
+    "pokedex_render_seconds": "Time to render UI components",
+    "pokedex_resource_lookups_total": "Species, evolution chain and type lookups by cache result",
+}
+
+_counters = {}
+_histograms = {}
+_lock = threading.Lock()
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float):
+        """Estimated quantile: the upper bound of the bucket that holds it."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _key(name, labels):
+    # Labels keep call-site order, so callers pass them in the same order
+    return name, tuple([(label, str(value)) for label, value in labels.items()]) if labels else ()
+
+
+def inc(name: str, value=1, **labels):
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels):
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+def timer(name: str, **labels):
+    """Context manager observing its duration into a histogram (a shared no-op when disabled)."""
+    if not ENABLED:
+        return _NO_TIMER
+    return _Timer(name, labels)
+
+
+def snapshot() -> dict:
+    """{"counters": {(name, labels): value}, "histograms": {(name, labels): Histogram copy}}."""
+    with _lock:
+        histograms = {}
+        for key, histogram in _histograms.items():
+            copy = histograms[key] = Histogram()
+            copy.counts, copy.sum, copy.count = list(histogram.counts), histogram.sum, histogram.count
+        return {"counters": dict(_counters), "histograms": histograms}
+
+
+def _labels(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def render() -> str:
+    """Everything recorded so far in Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+    described = set()
+
+    def describe(name, kind):
+        if name not in described:
+            described.add(name)
+            if name in HELP:
+                lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(data["counters"].items()):
+        describe(name, "counter")
+        lines.append(f"{name}{_labels(labels)} {value}")
+    for (name, labels), histogram in sorted(data["histograms"].items()):
+        describe(name, "histogram")
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), histogram.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_labels(labels, [('le', le)])} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path: str):
+    """Write render() atomically, e.g. for node_exporter's textfile collector."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp_path, path)
+
+
+def serve(port: int, host="127.0.0.1") -> "ThreadingHTTPServer":
+    """Serve render() at http://host:port/metrics from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+    return server
+
+
+if PORT:
+    enable()
+    serve(PORT)
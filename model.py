@@ -0,0 +1,81 @@
+import json
+from array import array
+
+# Base stats are stored in this fixed order
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+STAT_INDEX = {name: i for i, name in enumerate(STAT_NAMES)}
+
+
+class Pokemon:
+    """The few fields the app actually shows, projected out of the PokeAPI payload.
+
+    The raw /pokemon/{name} JSON carries hundreds of moves, game indices and
+    sprite variants we never read; this record keeps only what the renderers
+    need, with the six base stats packed into an unsigned short array.
+    """
+    __slots__ = ("id", "name", "types", "abilities", "stats", "artwork", "species")
+
+    def __init__(self, id, name, types, abilities, stats, artwork=None, species=None):
+        self.id = id
+        self.name = name
+        self.types = tuple(types)
+        self.abilities = tuple(abilities)
+        self.stats = stats if isinstance(stats, array) else array("H", stats)
+        self.artwork = artwork
+        # Species name, for following the evolution chain (same as name for most Pokemon)
+        self.species = species or name
+
+    @classmethod
+    def from_api(cls, data: dict) -> "Pokemon":
+        """Projection parser for the raw /pokemon/{name} response."""
+        stats = array("H", bytes(2 * len(STAT_NAMES)))
+        for entry in data["stats"]:
+            index = STAT_INDEX.get(entry["stat"]["name"])
+            if index is not None:
+                stats[index] = entry["base_stat"]
+        artwork = (data.get("sprites") or {}).get("other", {}).get("official-artwork", {}).get("front_default")
+        return cls(
+            data.get("id"),
+            data["name"],
+            [t["type"]["name"] for t in data["types"]],
+            [a["ability"]["name"] for a in data["abilities"]],
+            stats,
+            artwork,
+            (data.get("species") or {}).get("name"),
+        )
+
+    @property
+    def total(self) -> int:
+        return sum(self.stats)
+
+    def stat(self, name: str) -> int:
+        return self.stats[STAT_INDEX[name]]
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "types": list(self.types),
+            "abilities": list(self.abilities),
+            "stats": self.stats.tolist(),
+            "artwork": self.artwork,
+            "species": self.species,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Pokemon":
+        # Entries written before the compact format still hold the raw payload
+        if "sprites" in data:
+            return cls.from_api(data)
+        return cls(data["id"], data["name"], data["types"], data["abilities"], data["stats"], data.get("artwork"),
+                   data.get("species"))
+
+    def dumps(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, text: str) -> "Pokemon":
+        return cls.from_dict(json.loads(text))
+
+    def __repr__(self):
+        return f"Pokemon({self.name!r}, types={list(self.types)}, total={self.total})"
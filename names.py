@@ -0,0 +1,96 @@
+"""Local index of every Pokemon name, for validation, autocomplete and "did you mean".
+
+Prefix completion is a binary search over the sorted names. Fuzzy matching
+uses a trigram index to shortlist candidates, which are then ranked by
+Levenshtein distance, so a typo is answered in well under a millisecond
+without asking the API.
+"""
+import bisect
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from itertools import chain
+
+NAMES_PATH = os.environ.get("POKEDEX_NAMES_PATH", ".pokedex_names.json")
+NAMES_TTL = float(os.environ.get("POKEDEX_NAMES_TTL", 24 * 3600))
+
+
+def levenshtein(a: str, b: str) -> int:
+    """Edit distance between two strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def trigrams(name: str):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """All known names with exact, prefix and fuzzy lookups."""
+
+    def __init__(self, names):
+        self.names = sorted(set(names))
+        self._known = frozenset(self.names)
+        self._trigrams = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                self._trigrams[gram].append(i)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._known
+
+    def complete(self, prefix: str, limit=10):
+        """Names starting with prefix, alphabetically."""
+        start = bisect.bisect_left(self.names, prefix)
+        matches = []
+        for name in self.names[start:start + limit]:
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+        return matches
+
+    def suggest(self, name: str, limit=3, shortlist=20):
+        """Closest known names to a misspelled one, best first."""
+        if not name:
+            return []
+        overlap = Counter(chain.from_iterable(self._trigrams.get(gram, ()) for gram in trigrams(name)))
+        max_distance = max(2, len(name) // 3)
+        scored = sorted(
+            (levenshtein(name, self.names[i]), self.names[i])
+            for i, _ in overlap.most_common(shortlist)
+            if abs(len(self.names[i]) - len(name)) <= max_distance
+        )
+        return [candidate for distance, candidate in scored if distance <= max_distance][:limit]
+
+
+def load_names(path=None, ttl=None):
+    """Names saved by save_names, or None if missing or older than ttl."""
+    ttl = NAMES_TTL if ttl is None else ttl
+    try:
+        with open(path or NAMES_PATH) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - saved.get("fetched_at", 0) > ttl:
+        return None
+    return saved["names"]
+
+
+def save_names(names, path=None):
+    path = path or NAMES_PATH
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"fetched_at": time.time(), "names": list(names)}, f)
+    os.replace(tmp_path, path)
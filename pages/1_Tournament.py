@@ -0,0 +1,70 @@
+import streamlit as st
+import time
+import tournament
+
+# 1. Page Configuration
+st.set_page_config(
+    page_title="Pokemon Tournament",
+    page_icon="🏟️",
+    layout="wide"
+)
+
+st.markdown("""
+            <style>
+            .stApp{
+                background-color: #0B0C10;
+                color: white;
+            }
+            </style>
+""" , unsafe_allow_html = True)
+
+st.title("🏟️ Round-Robin Tournament")
+st.info("Every Pokemon fights every other one once. Higher total stats wins!")
+
+source = st.radio("Who enters?", ["Pick Pokemon", "A generation", "The whole Pokedex"], horizontal=True)
+
+if source == "Pick Pokemon":
+    names_text = st.text_area("Pokemon names (comma or newline separated):", placeholder="pikachu, charizard, lucario, blastoise")
+    generation = None
+elif source == "A generation":
+    generation = st.selectbox("Generation", list(tournament.GENERATIONS), format_func=lambda g: f"Generation {g}")
+else:
+    generation = None
+
+col1, col2 = st.columns(2)
+with col1:
+    top_k = st.slider("Show top", min_value=5, max_value=100, value=20)
+with col2:
+    rank_by = st.selectbox("Rank by", ["elo", "total", "wins"])
+
+if st.button("🏁 START TOURNAMENT"):
+    start = time.perf_counter()
+    if source == "Pick Pokemon":
+        names = [n for n in names_text.replace("\n", ",").split(",") if n.strip()]
+        result, failed = tournament.from_names(names)
+        for failure in failed:
+            st.warning(f"Skipped '{failure.name}': not found in the Pokedex.")
+    else:
+        try:
+            result = tournament.from_snapshot(generation=generation)
+        except RuntimeError as e:
+            st.error(str(e))
+            st.stop()
+
+    if len(result) < 2:
+        st.warning("A tournament needs at least two Pokemon!")
+    else:
+        standings = result.standings(top_k, by=rank_by)
+        elapsed = time.perf_counter() - start
+        st.success(f"{len(result)} Pokemon, {result.matchups:,} matchups decided in {elapsed * 1000:.0f} ms")
+        st.dataframe(
+            [
+                {"Rank": rank, "Pokemon": name.title(), "Total": total, "Wins": wins,
+                 "Losses": losses, "Ties": ties, "Elo": rating}
+                for rank, name, total, wins, losses, ties, rating in standings
+            ],
+            width="stretch",
+            hide_index=True,
+        )
+        champion = standings[0]
+        st.markdown(f"<div style='text-align: center; font-size: 32px; font-weight: bold; color: #F9C74F;'>🏆 CHAMPION: {champion[1].upper()} 🏆</div>", unsafe_allow_html=True)
@@ -0,0 +1,71 @@
+import streamlit as st
+import time
+import team
+
+# 1. Page Configuration
+st.set_page_config(
+    page_title="Pokemon Team Battle",
+    page_icon="👥",
+    layout="wide"
+)
+
+st.markdown("""
+            <style>
+            .stApp{
+                background-color: #0B0C10;
+                color: white;
+            }
+            </style>
+""" , unsafe_allow_html = True)
+
+st.title("👥 Six-versus-Six Team Battle")
+st.info("Every Pokemon on one team meets every Pokemon on the other. Higher total stats wins each pairing!")
+
+col1, col2 = st.columns(2)
+with col1:
+    team1_text = st.text_area("Team 1 (up to six, comma or newline separated):", placeholder="pikachu, charizard, lucario")
+with col2:
+    team2_text = st.text_area("Team 2 (up to six, comma or newline separated):", placeholder="blastoise, gengar, dragonite")
+
+
+def parse_team(text):
+    return [n for n in text.replace("\n", ",").split(",") if n.strip()][:team.TEAM_SIZE]
+
+
+if st.button("⚔️ START TEAM BATTLE"):
+    start = time.perf_counter()
+    result, failed = team.from_names(parse_team(team1_text), parse_team(team2_text))
+    for failure in failed:
+        st.warning(f"Skipped '{failure.name}': not found in the Pokedex.")
+
+    if result.empty_teams:
+        teams = " and ".join(f"team {side}" for side in result.empty_teams)
+        st.warning(f"No Pokemon of {teams} could be found. Both teams need at least one!")
+    else:
+        elapsed = time.perf_counter() - start
+        wins, losses, ties = result.wins
+        st.success(f"{result.pairings} pairings decided in {elapsed * 1000:.0f} ms: "
+                   f"team 1 wins {wins}, team 2 wins {losses}, {ties} ties")
+        st.caption("Total stat margin of each pairing, from team 1's side")
+        st.dataframe(
+            [{"Team 1": name.title(), **{other.title(): margin for other, margin in margins.items()}}
+             for name, margins in result.matrix()],
+            width="stretch",
+            hide_index=True,
+        )
+
+        lineups = []
+        for side, names in ((1, result.names1), (2, result.names2)):
+            order, (w, l, t) = result.best_lineup(side)
+            lineups.append({"Team": side, "Best order": " → ".join(names[i].title() for i in order),
+                            "Wins": w, "Losses": l, "Ties": t})
+        w, l, t = result.lineup_score()
+        st.subheader("Lineups")
+        st.write(f"One-on-one in the order entered, team 1 goes {w}-{l}-{t}. "
+                 "Each team's best order against the other as entered:")
+        st.dataframe(lineups, width="stretch", hide_index=True)
+
+        if result.winner is None:
+            st.markdown("<div style='text-align: center; font-size: 32px; font-weight: bold; color: #F9C74F;'>🤝 IT'S A TIE! 🤝</div>", unsafe_allow_html=True)
+        else:
+            st.markdown(f"<div style='text-align: center; font-size: 32px; font-weight: bold; color: #F9C74F;'>🏆 TEAM {result.winner} WINS! 🏆</div>", unsafe_allow_html=True)
@@ -0,0 +1,77 @@
+import streamlit as st
+import time
+from html import escape
+import history
+from utils import normalize_name
+
+# 1. Page Configuration
+st.set_page_config(
+    page_title="Pokemon Leaderboard",
+    page_icon="🏅",
+    layout="wide"
+)
+
+st.markdown("""
+            <style>
+            .stApp{
+                background-color: #0B0C10;
+                color: white;
+            }
+            </style>
+""" , unsafe_allow_html = True)
+
+WINDOWS = {"All time": None, "Today": 1, "Last 7 days": 7, "Last 30 days": 30}
+
+st.title("🏅 Battle Leaderboard")
+st.info("Every battle fought in the arena is remembered. Who has won the most?")
+
+board = history.get_history()
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    window = st.selectbox("Period", list(WINDOWS))
+with col2:
+    rank_by = st.selectbox("Rank by", ["wins", "win_rate"], format_func=lambda key: key.replace("_", " ").title())
+with col3:
+    top_k = st.slider("Show top", min_value=5, max_value=100, value=20)
+
+rows = board.leaderboard(top_k, by=rank_by, days=WINDOWS[window])
+if not rows:
+    st.warning("No battles recorded yet. Head to the arena and fight!")
+else:
+    st.dataframe(
+        [
+            {"Rank": rank, "Pokemon": name.title(), "Battles": battles, "Wins": wins,
+             "Losses": losses, "Ties": ties, "Win %": round(win_rate * 100, 1)}
+            for rank, name, battles, wins, losses, ties, win_rate in rows
+        ],
+        width="stretch",
+        hide_index=True,
+    )
+
+st.subheader("📜 Head to head")
+col1, col2 = st.columns(2)
+with col1:
+    p1 = normalize_name(st.text_input("First Pokemon:", placeholder="pikachu"))
+with col2:
+    p2 = normalize_name(st.text_input("Second Pokemon:", placeholder="charizard"))
+if p1 and p2:
+    p1_wins, p2_wins, ties = board.head_to_head(p1, p2)
+    if p1_wins + p2_wins + ties:
+        st.markdown(f"<div style='text-align: center; font-size: 28px; font-weight: bold;'>{escape(p1.upper())} {p1_wins} – {p2_wins} {escape(p2.upper())}</div>", unsafe_allow_html=True)
+        st.caption(f"{ties} ties")
+    else:
+        st.info(f"{p1.title()} and {p2.title()} have never met.")
+
+st.subheader("🕑 Recent battles")
+recent = board.recent(20)
+if recent:
+    st.dataframe(
+        [
+            {"When": time.strftime("%Y-%m-%d %H:%M", time.localtime(at)), "Pokemon 1": p1.title(),
+             "Pokemon 2": p2.title(), "Totals": f"{total1} – {total2}", "Winner": winner.title() if winner else "Tie"}
+            for at, p1, p2, total1, total2, winner in recent
+        ],
+        width="stretch",
+        hide_index=True,
+    )
@@ -1,58 +1,81 @@
-import requests
+import argparse
+
+import utils
+from model import STAT_NAMES, Pokemon
+from utils import get_many_pokemon, lookup
+
+def report_lookup_error(pokemon_name: str, result) -> None:
+    if result.error is not None:
+        print(f"📡 Connection Error: Could not reach the Pokemon Lab. ({result.error})")
+    elif result.status == 404:
+        print(f"❌ Error: Pokemon '{pokemon_name}' not found. Check your spelling!")
+        if result.suggestions:
+            print(f"💡 Did you mean: {', '.join(s.capitalize() for s in result.suggestions)}?")
+    elif result.status is not None:
+        print(f"⚠️ API Error: Status code {result.status}")
 
 def get_pokemon_data(pokemon_name: str):
-    try:
-        clean_name = pokemon_name.strip().lower()
-        if not clean_name:
-            return None
-        
-        response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{pokemon_name.lower()}")
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
-            print(f"❌ Error: Pokemon '{pokemon_name}' not found. Check your spelling!")
-        else:
-            print(f"⚠️ API Error: Status code {response.status_code}")
-        return None
-    except requests.exceptions.RequestException as e:
-        print(f"📡 Connection Error: Could not reach the Pokemon Lab. ({e})")
-        return None
+    result = lookup(pokemon_name)
+    if result.ok:
+        return result.data
+    if result.name:
+        report_lookup_error(pokemon_name, result)
+    return None
 
-def display_pokemon_info(data: dict) -> int:
+def display_pokemon_info(data: Pokemon) -> int:
     if not data:
         return 0
     
     print(f"\n{'='*30}")
-    print(f"✨ POKEDEX ENTRY: {data['name'].upper()} ✨")
+    print(f"✨ POKEDEX ENTRY: {data.name.upper()} ✨")
     print(f"{'='*30}")
     
-    print(f"Types:     {', '.join(t['type']['name'].capitalize() for t in data['types'])}")
-    print(f"Abilities: {', '.join(a['ability']['name'].capitalize() for a in data['abilities'])}")
+    print(f"Types:     {', '.join(t.capitalize() for t in data.types)}")
+    print(f"Abilities: {', '.join(a.capitalize() for a in data.abilities)}")
     
     # Official Artwork Safe-Check
-    artwork = data['sprites'].get('other', {}).get('official-artwork', {}).get('front_default')
-    if artwork:
-        print(f"Artwork:   {artwork}")
+    if data.artwork:
+        print(f"Artwork:   {data.artwork}")
+
+    # Ranks need the snapshot; without one, don't pay for importing NumPy
+    placements = {}
+    if utils.get_snapshot() is not None:
+        import ranks
+        placements = ranks.placements(data)
 
     print("\nBASE STATS:")
     total_stats = 0
-    for stat_entry in data['stats']:
-        stat_name = stat_entry['stat']['name'].replace('-', ' ').capitalize()
-        stat_val = stat_entry['base_stat']
-        print(f"📊 {stat_name:15}: {stat_val}")
+    for stat_key, stat_val in zip(STAT_NAMES, data.stats):
+        stat_name = stat_key.replace('-', ' ').capitalize()
+        rank = f" ({placements[stat_key].label})" if placements else ""
+        print(f"📊 {stat_name:15}: {stat_val:<4}{rank}")
         total_stats += stat_val
     
     print(f"{'-'*30}")
-    print(f"TOTAL POWER: {total_stats}")
+    if placements:
+        total_rank = placements["total"]
+        print(f"TOTAL POWER: {total_stats} ({total_rank.label} of {total_rank.count:,}, #{total_rank.rank:,})")
+        index = ranks.get_index()
+        stronger, weaker = index.stronger(total_stats), index.weaker(total_stats)
+        if stronger:
+            print(f"Next stronger: {stronger[0]} ({stronger[1]})")
+        if weaker:
+            print(f"Next weaker:   {weaker[0]} ({weaker[1]})")
+    else:
+        print(f"TOTAL POWER: {total_stats}")
     print(f"{'-'*30}")
     
     return total_stats
 
 def compare_pokemons(p1_name: str, p2_name: str):
-    data1 = get_pokemon_data(p1_name)
-    data2 = get_pokemon_data(p2_name)
+    # Fetch both fighters at once
+    results = get_many_pokemon([p1_name, p2_name])
+    for name, result in zip([p1_name, p2_name], results):
+        if not result.ok and result.name:
+            report_lookup_error(name, result)
+    data1, data2 = (result.data for result in results)
 
-    if data1 and data2:
+    if not (data1 and data2):
         print(f"⚔️ Comparison failed: One or both Pokemon were not found.")
         return
     
@@ -63,13 +86,20 @@ def compare_pokemons(p1_name: str, p2_name: str):
     print("\n" + "🏁" * 15)
     print("\nResults:")
     if total1 > total2:
-        print(f"🏆 {data1['name'].upper()} wins with total {total1} power")
+        print(f"🏆 {data1.name.upper()} wins with total {total1} power")
     elif total2 > total1:
-        print(f"🏆 {data2['name'].upper()} wins with total {total2} power")
+        print(f"🏆 {data2.name.upper()} wins with total {total2} power")
     else:
         print(f"🤝 It's a tie! Both have {total1}.")
+    import history
+    history.record(data1.name, data2.name, total1, total2, source="cli")
+
+    from simulator import simulate
+    sim = simulate(data1, data2)
+    low, high = sim.confidence_interval()
+    print(f"🎲 Simulated battles: {data1.name.upper()} wins {sim.win_rate:.1%} of {sim.n:,} (95% CI {low:.1%}-{high:.1%})")
 
-def main():
+def arena():
     print("Welcome to the Python Pokemon Arena!")
 
     while True:
@@ -95,6 +125,205 @@ def main():
             break
         else:
             print("Invalid choice. Please try 1, 2, or q.")
+
+def cmd_mirror(args):
+    import snapshot
+    snapshot.mirror(args.out, rate=args.rate, workers=args.workers, limit=args.limit, refresh=args.refresh)
+
+def cmd_tournament(args):
+    import tournament
+    if args.names:
+        result, failed = tournament.from_names(args.names)
+        for failure in failed:
+            report_lookup_error(failure.name, failure)
+    else:
+        try:
+            result = tournament.from_snapshot(generation=args.generation)
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            return
+    if len(result) < 2:
+        print("⚔️ A tournament needs at least two Pokemon.")
+        return
+
+    print(f"\n🏟️  ROUND ROBIN: {len(result)} Pokemon, {result.matchups:,} matchups")
+    print(f"{'#':>4}  {'Pokemon':20} {'Total':>5} {'W':>5} {'L':>5} {'T':>5} {'Elo':>7}")
+    for rank, name, total, wins, losses, ties, rating in result.standings(args.top, by=args.by):
+        print(f"{rank:>4}  {name:20} {total:>5} {wins:>5} {losses:>5} {ties:>5} {rating:>7}")
+
+def cmd_team(args):
+    import team
+    names1 = [n for n in args.team1.split(",") if n.strip()]
+    names2 = [n for n in args.team2.split(",") if n.strip()]
+    result, failed = team.from_names(names1, names2)
+    for failure in failed:
+        report_lookup_error(failure.name, failure)
+    if result.empty_teams:
+        teams = " and ".join(f"team {side}" for side in result.empty_teams)
+        print(f"⚔️ Team battle failed: no Pokemon of {teams} could be found.")
+        return
+
+    print(f"\n⚔️  TEAM BATTLE: {len(result.names1)} VS {len(result.names2)} ({result.pairings} pairings)")
+    print(f"{'':20}" + "".join(f"{name[:10]:>11}" for name in result.names2))
+    for name, margins in result.matrix():
+        print(f"{name[:20]:20}" + "".join(f"{margin:>+11}" for margin in margins.values()))
+
+    wins, losses, ties = result.wins
+    print(f"\nCross pairings: team 1 wins {wins}, team 2 wins {losses}, {ties} ties")
+    if result.winner is None:
+        print("🤝 It's a tie between the teams!")
+    else:
+        print(f"🏆 Team {result.winner} wins!")
+    print(f"One-on-one as entered: {'-'.join(map(str, result.lineup_score()))} (W-L-T for team 1)")
+    for side, names in ((1, result.names1), (2, result.names2)):
+        order, score = result.best_lineup(side)
+        print(f"Best order for team {side}: {', '.join(names[i] for i in order)} ({'-'.join(map(str, score))})")
+
+def cmd_leaderboard(args):
+    import history
+    board = history.get_history()
+    if args.vs:
+        p1, p2 = (utils.normalize_name(name) for name in args.vs)
+        wins1, wins2, ties = board.head_to_head(p1, p2)
+        print(f"\n📜 HEAD TO HEAD: {p1.upper()} {wins1} – {wins2} {p2.upper()}, {ties} ties")
+        return
+    rows = board.leaderboard(args.top, by=args.by, days=args.days, min_battles=args.min_battles)
+    if not rows:
+        print("📜 No battles recorded yet. Go fight some!")
+        return
+    window = f"last {args.days} days" if args.days else "all time"
+    print(f"\n🏅 LEADERBOARD ({window})")
+    print(f"{'#':>4}  {'Pokemon':20} {'Battles':>7} {'W':>5} {'L':>5} {'T':>5} {'Win %':>6}")
+    for rank, name, battles, wins, losses, ties, win_rate in rows:
+        print(f"{rank:>4}  {name:20} {battles:>7} {wins:>5} {losses:>5} {ties:>5} {win_rate:>6.1%}")
+
+def cmd_evolution(args):
+    import resources
+    data = get_pokemon_data(args.name)
+    if not data:
+        return
+    line = resources.evolution_line(data)
+    print(f"\n🧬 EVOLUTION LINE: {data.name.upper()}")
+    for stage, species, parent, member in line.members:
+        if member is None:
+            print(f"  {stage}. {species:20} (couldn't be loaded)")
+            continue
+        marker = " ◀" if member.name == data.name else ""
+        print(f"  {stage}. {member.name:20} {'/'.join(member.types):18} total {member.total:>4} "
+              f"({member.total - data.total:+d}){marker}")
+    matchups = line.matchups(data)
+    for label, test in (("Weak to", lambda m: m > 1), ("Resists", lambda m: 0 < m < 1), ("Immune to", lambda m: m == 0)):
+        found = [f"{t} x{m:g}" for t, m in sorted(matchups.items(), key=lambda item: -item[1]) if test(m)]
+        if found:
+            print(f"{label}: {', '.join(found)}")
+    for url, error in line.errors.items():
+        print(f"📡 Could not load {url}: {error}")
+
+def cmd_warmup(args):
+    import warmup
+    names = args.names or warmup.popular_names(args.history_top)
+    print(f"🔥 Warming the cache with {len(names)} Pokemon...")
+    summary = warmup.warm_up(names, artwork=not args.no_artwork)
+    print(f"✅ {summary['ok']} cached, {summary['failed']} failed in {summary['seconds']} s")
+
+def _run_batch(args, fn, fields):
+    import sys
+
+    import batch
+    try:
+        summary = batch.run(fn, batch.read_lines(args.input), fields, fmt=args.format,
+                            workers=args.workers, ordered=not args.unordered)
+    except BrokenPipeError:
+        sys.stderr.close()  # e.g. piped into head; nothing left to report
+        return
+    print(f"📋 {summary['total']} done in {summary['seconds']} s ({summary['per_second']}/s): "
+          f"{summary['ok']} ok, {summary['not_found']} not found, {summary['error']} errors", file=sys.stderr)
+
+def cmd_lookup(args):
+    import batch
+    _run_batch(args, batch.lookup_record, batch.LOOKUP_FIELDS)
+
+def cmd_battle(args):
+    import batch
+    _run_batch(args, lambda line: batch.battle_record(line, sims=args.sims, seed=args.seed), batch.BATTLE_FIELDS)
+
+def add_batch_options(command, what):
+    command.add_argument("input", nargs="?", default="-", help=f"file with one {what} per line (default: stdin)")
+    command.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="output format (default: %(default)s)")
+    command.add_argument("--workers", type=int, default=utils.MAX_WORKERS, help="parallel lookups (default: %(default)s)")
+    command.add_argument("--unordered", action="store_true", help="write results as they complete, not in input order")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="The Python Pokemon Arena. Run without a command for the interactive menu.")
+    parser.add_argument("--offline", action="store_true", help="serve lookups from the offline snapshot only")
+    parser.add_argument("--metrics", metavar="FILE", help="record fetch metrics and write them to FILE (Prometheus text) on exit")
+    commands = parser.add_subparsers(dest="command")
+
+    mirror = commands.add_parser("mirror", help="crawl every Pokemon into a local offline snapshot")
+    mirror.add_argument("--out", default=utils.SNAPSHOT_PATH, help="snapshot directory (default: %(default)s)")
+    mirror.add_argument("--rate", type=float, default=10.0, help="max requests per second (default: %(default)s)")
+    mirror.add_argument("--workers", type=int, default=4, help="parallel fetches (default: %(default)s)")
+    mirror.add_argument("--limit", type=int, help="only fetch the first N Pokemon (the rest of an existing snapshot is kept)")
+    mirror.add_argument("--refresh", action="store_true", help="refetch Pokemon already in the snapshot")
+    mirror.set_defaults(func=cmd_mirror)
+
+    tourney = commands.add_parser("tournament", help="round robin between many Pokemon by total stats")
+    tourney.add_argument("names", nargs="*", help="Pokemon to enter (default: the whole offline snapshot)")
+    tourney.add_argument("--generation", type=int, choices=range(1, 10), metavar="1-9",
+                         help="only this generation from the offline snapshot")
+    tourney.add_argument("--top", type=int, default=10, help="how many standings to show (default: %(default)s)")
+    tourney.add_argument("--by", choices=["elo", "total", "wins"], default="elo", help="ranking key (default: %(default)s)")
+    tourney.set_defaults(func=cmd_tournament)
+
+    team_battle = commands.add_parser("team", help="six-versus-six team battle by total stats")
+    team_battle.add_argument("team1", help="comma-separated Pokemon, up to six")
+    team_battle.add_argument("team2", help="comma-separated Pokemon, up to six")
+    team_battle.set_defaults(func=cmd_team)
+
+    leaderboard = commands.add_parser("leaderboard", help="best Pokemon from the recorded battle history")
+    leaderboard.add_argument("--top", type=int, default=10, help="how many to show (default: %(default)s)")
+    leaderboard.add_argument("--by", choices=["wins", "win_rate"], default="wins", help="ranking key (default: %(default)s)")
+    leaderboard.add_argument("--days", type=int, help="only battles from the last N days")
+    leaderboard.add_argument("--min-battles", type=int, default=1, help="hide Pokemon with fewer battles (default: %(default)s)")
+    leaderboard.add_argument("--vs", nargs=2, metavar="POKEMON", help="show the head-to-head record of two Pokemon instead")
+    leaderboard.set_defaults(func=cmd_leaderboard)
+
+    evolution = commands.add_parser("evolution", help="a Pokemon's evolution line and type matchups")
+    evolution.add_argument("name")
+    evolution.set_defaults(func=cmd_evolution)
+
+    warm = commands.add_parser("warmup", help="preload popular Pokemon (and their artwork) into the caches")
+    warm.add_argument("names", nargs="*", help="Pokemon to load (default: POKEDEX_WARMUP_NAMES plus the history's top)")
+    warm.add_argument("--history-top", type=int, default=None, help="how many of the history's top Pokemon to add")
+    warm.add_argument("--no-artwork", action="store_true", help="skip downloading artwork")
+    warm.set_defaults(func=cmd_warmup)
+
+    batch_lookup = commands.add_parser("lookup", help="look up many Pokemon from a file or stdin, streaming JSON Lines/CSV")
+    add_batch_options(batch_lookup, "name")
+    batch_lookup.set_defaults(func=cmd_lookup)
+
+    batch_battle = commands.add_parser("battle", help="score many matchups (\"pikachu,charizard\" per line) from a file or stdin")
+    add_batch_options(batch_battle, "pair")
+    batch_battle.add_argument("--sims", type=int, default=1000, help="simulated battles per matchup, 0 to skip (default: %(default)s)")
+    batch_battle.add_argument("--seed", type=int, help="random seed for reproducible simulations")
+    batch_battle.set_defaults(func=cmd_battle)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.offline:
+        utils.OFFLINE = True
+    if args.metrics:
+        import metrics
+        metrics.enable()
+    try:
+        if args.command is None:
+            arena()
+        else:
+            args.func(args)
+    finally:
+        if args.metrics:
+            metrics.write_file(args.metrics)
         
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""Pokedex-wide rank and percentile index for the stat total and each base stat.
+
+One sorted NumPy column per stat over every Pokemon we know about (the
+offline snapshot plus everything looked up so far), so rank, "top X%" and
+the nearest stronger or weaker Pokemon are a binary search. Placements are
+only given once a snapshot is there to rank against. The index is saved
+to disk, picks up a new snapshot's Pokemon when one appears and
+grows one Pokemon at a time as new ones are displayed. It never calls the API.
+"""
+import os
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+import cache
+import utils
+from model import STAT_NAMES
+
+RANKS_PATH = os.environ.get("POKEDEX_RANKS_PATH", ".pokedex_ranks.npz")
+
+# Column 0 is the base-stat total, then the stats in model.STAT_NAMES order
+COLUMNS = ("total", *STAT_NAMES)
+COLUMN_INDEX = {name: i for i, name in enumerate(COLUMNS)}
+
+
+class Placement(NamedTuple):
+    """Where a value ranks among `count` Pokemon (rank 1 is the highest)."""
+    rank: int
+    count: int
+
+    @property
+    def top_percent(self) -> float:
+        return 100 * self.rank / self.count
+
+    @property
+    def label(self) -> str:
+        top = self.top_percent
+        return f"top {top:.1f}%" if top < 1 else f"top {top:.0f}%"
+
+
+def _columns(stats: np.ndarray) -> np.ndarray:
+    """(N, 7) int32 values: the total, then each stat."""
+    return np.column_stack([stats.sum(axis=1, dtype=np.int32), stats.astype(np.int32)])
+
+
+class RankIndex:
+    """Sorted stat columns over a set of Pokemon.
+
+    `order[c]` lists rows by ascending value of column c and `sorted[c]`
+    holds those values, so every query is one np.searchsorted.
+    """
+
+    def __init__(self, names, stats, order=None, source=None):
+        self.names = list(names)
+        self.stats = np.asarray(stats, dtype=np.uint16).reshape(len(self.names), len(STAT_NAMES))
+        # created_at of the snapshot merged in last, if any
+        self.source = source
+        self._rows = {name: row for row, name in enumerate(self.names)}
+        self._lock = threading.Lock()
+        values = _columns(self.stats)
+        if order is None or np.shape(order) != (len(COLUMNS), len(self.names)):
+            order = np.argsort(values, axis=0, kind="stable").T
+        self.order = np.asarray(order, dtype=np.int32)
+        self.sorted = np.take_along_axis(values, self.order.T, axis=0).T
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def add(self, pokemon_list) -> int:
+        """Insert Pokemon not in the index yet into every sorted column; returns how many were new."""
+        with self._lock:
+            new = [p for p in dict((p.name, p) for p in pokemon_list).values() if p.name not in self._rows]
+            if not new:
+                return 0
+            first = len(self.names)
+            stats = np.array([p.stats for p in new], dtype=np.uint16).reshape(len(new), len(STAT_NAMES))
+            values = _columns(stats)
+            rows = np.arange(first, first + len(new), dtype=np.int32)
+            order, sorted_values = [], []
+            for c in range(len(COLUMNS)):
+                by_value = np.argsort(values[:, c], kind="stable")
+                positions = np.searchsorted(self.sorted[c], values[by_value, c], side="right")
+                order.append(np.insert(self.order[c], positions, rows[by_value]))
+                sorted_values.append(np.insert(self.sorted[c], positions, values[by_value, c]))
+            for offset, p in enumerate(new):
+                self._rows[p.name] = first + offset
+            self.names.extend(p.name for p in new)
+            self.stats = np.concatenate([self.stats, stats])
+            # New arrays replace the old ones whole, so queries never see a partly inserted column
+            self.order, self.sorted = np.array(order), np.array(sorted_values)
+            return len(new)
+
+    def placement(self, value: int, column="total"):
+        """Placement of a value in a column, or None for an empty index."""
+        values = self.sorted[COLUMN_INDEX[column]]
+        if not len(values):
+            return None
+        higher = len(values) - int(np.searchsorted(values, value, side="right"))
+        return Placement(higher + 1, len(values))
+
+    def placements(self, pokemon) -> dict:
+        """{column: Placement} for the total and every stat of one Pokemon."""
+        values = (pokemon.total, *pokemon.stats)
+        return {column: self.placement(value, column) for column, value in zip(COLUMNS, values)}
+
+    def percentile(self, value: int, column="total") -> float:
+        """Percentage of Pokemon with a strictly lower value."""
+        values = self.sorted[COLUMN_INDEX[column]]
+        return 100 * int(np.searchsorted(values, value, side="left")) / len(values) if len(values) else 0.0
+
+    def stronger(self, value: int, column="total"):
+        """(name, value) of the closest Pokemon above value, or None at the top."""
+        c = COLUMN_INDEX[column]
+        i = int(np.searchsorted(self.sorted[c], value, side="right"))
+        return (self.names[self.order[c, i]], int(self.sorted[c, i])) if i < len(self.names) else None
+
+    def weaker(self, value: int, column="total"):
+        """(name, value) of the closest Pokemon below value, or None at the bottom."""
+        c = COLUMN_INDEX[column]
+        i = int(np.searchsorted(self.sorted[c], value, side="left")) - 1
+        return (self.names[self.order[c, i]], int(self.sorted[c, i])) if i >= 0 else None
+
+    def save(self, path=None):
+        path = path or RANKS_PATH
+        tmp_path = f"{path}.tmp.npz"
+        # The lock also keeps two saves from swapping each other's temporary file in
+        with self._lock:
+            np.savez(tmp_path, names=np.array(self.names, dtype=str), stats=self.stats, order=self.order,
+                     source=np.array(self.source if self.source is not None else np.nan, dtype=np.float64))
+            os.replace(tmp_path, path)
+
+
+def load_index(path=None):
+    """The index saved by RankIndex.save, or None if missing or unreadable."""
+    try:
+        with np.load(path or RANKS_PATH) as saved:
+            source = float(saved["source"])
+            return RankIndex(saved["names"].tolist(), saved["stats"], saved["order"],
+                             source=None if np.isnan(source) else source)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def build_index():
+    """A fresh index from the offline snapshot and every Pokemon in the response cache."""
+    snapshot = utils.get_snapshot()
+    if snapshot is not None:
+        index = RankIndex(snapshot.names, np.asarray(snapshot.stats), source=snapshot.created_at)
+    else:
+        index = RankIndex([], np.empty((0, len(STAT_NAMES))))
+    index.add(cache.get_cache().values())
+    return index
+
+
+_index = None
+_index_lock = threading.Lock()
+_save_pending = False
+_save_lock = threading.Lock()
+
+
+def save_in_background(index):
+    """Save the index off the caller's thread; saves asked for while one is queued are folded into it."""
+    global _save_pending
+    with _save_lock:
+        if _save_pending:
+            return
+        _save_pending = True
+    utils.run_in_background(_save, index, RANKS_PATH)
+
+
+def _save(index, path):
+    global _save_pending
+    with _save_lock:
+        _save_pending = False
+    index.save(path)
+
+
+def get_index() -> RankIndex:
+    """The shared index: loaded from disk, or built once, and topped up from a newer snapshot."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = load_index()
+            if _index is None:
+                _index = build_index()
+                save_in_background(_index)
+        snapshot = utils.get_snapshot()
+        if snapshot is not None and _index.source != snapshot.created_at:
+            missing = [row for row, name in enumerate(snapshot.names) if name not in _index]
+            _index.add(snapshot.pokemon_at(row) for row in missing)
+            _index.source = snapshot.created_at
+            save_in_background(_index)
+        return _index
+
+
+def placements(pokemon) -> dict:
+    """{column: Placement} for a Pokemon, or {} when there is no snapshot.
+
+    Without the snapshot the index only holds the Pokemon seen so far, so a
+    rank would say nothing about the whole Pokedex. A Pokemon new to the
+    index is added to it, and the index saved in the background.
+    """
+    if utils.get_snapshot() is None:
+        return {}
+    index = get_index()
+    if pokemon.name not in index and index.add([pokemon]):
+        save_in_background(index)
+    return index.placements(pokemon)
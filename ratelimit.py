@@ -0,0 +1,187 @@
+"""Client-side rate limiting and adaptive concurrency for outgoing requests.
+
+Each upstream host gets a HostLimiter that combines:
+
+* a token bucket capping requests per second (with a burst allowance), and
+* an AIMD concurrency limit: it grows by about one slot per round-trip while
+  responses are fast, and halves (at most once per round-trip) on a 429
+  or when latency goes over target.
+
+Callers wait for a token and a slot before every attempt, including
+retries, so bursts queue locally instead of tipping the API into throttling.
+"""
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+RATE = float(os.environ.get("POKEAPI_RATE", 20))
+BURST = int(os.environ.get("POKEAPI_BURST", 20))
+MAX_CONCURRENCY = int(os.environ.get("POKEAPI_MAX_CONCURRENCY", 16))
+INITIAL_CONCURRENCY = int(os.environ.get("POKEAPI_INITIAL_CONCURRENCY", 4))
+LATENCY_TARGET = float(os.environ.get("POKEAPI_LATENCY_TARGET", 1.0))
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, `burst` at once."""
+
+    def __init__(self, rate: float, burst=None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, returning how long to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted by additive increase / multiplicative decrease."""
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=1, maximum=MAX_CONCURRENCY,
+                 latency_target=LATENCY_TARGET, backoff=0.5):
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> bool:
+        """Wait for a free slot; True if we had to queue for it."""
+        with self._cond:
+            queued = self.in_flight >= int(self.limit)
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            return queued
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free right now."""
+        with self._cond:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, throttled=False):
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled or latency > self.latency_target:
+                # One decrease per round-trip, however many requests saw the same congestion
+                if now - self._last_decrease > latency:
+                    self.limit = max(self.minimum, self.limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class HostLimiter:
+    """Token bucket plus adaptive concurrency for one host, with counters."""
+
+    def __init__(self, rate=RATE, burst=BURST, **adaptive):
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveLimiter(**adaptive)
+        self.requests = 0
+        self.queued = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until this request may go out; returns the start timestamp."""
+        start = time.monotonic()
+        queued = self.concurrency.acquire()
+        delayed = self.bucket.acquire() > 0
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self.queued += queued or delayed
+            self.wait_seconds += now - start
+        return now
+
+    async def acquire_async(self, poll_interval=0.005) -> float:
+        """acquire() for asyncio callers: waits with asyncio.sleep, never blocking the event loop."""
+        import asyncio
+
+        start = time.monotonic()
+        queued = False
+        while not self.concurrency.try_acquire():
+            queued = True
+            await asyncio.sleep(poll_interval)
+        wait = self.bucket.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self.queued += queued or wait > 0
+            self.wait_seconds += now - start
+        return now
+
+    def release(self, started: float, status=None, failed=False):
+        """Report how the request went: its status, or failed=True if no response arrived."""
+        throttled = status == 429
+        if throttled:
+            with self._lock:
+                self.throttled += 1
+        self.concurrency.release(time.monotonic() - started, throttled=throttled or failed)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "queued": self.queued,
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "concurrency_limit": round(self.concurrency.limit, 2),
+                "in_flight": self.concurrency.in_flight,
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(url: str) -> HostLimiter:
+    """The shared limiter for a URL's host."""
+    host = urlsplit(url).netloc
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter()
+        return limiter
+
+
+def configure(url: str, **settings) -> HostLimiter:
+    """Replace the limiter for a URL's host, e.g. configure(url, rate=0) for no rate cap."""
+    host = urlsplit(url).netloc
+    with _limiters_lock:
+        limiter = _limiters[host] = HostLimiter(**settings)
+        return limiter
+
+
+def metrics() -> dict:
+    """Counters per host: requests, queued, throttled (429s), wait time and limits."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.metrics() for host, limiter in limiters.items()}
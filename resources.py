@@ -0,0 +1,255 @@
+"""Linked PokeAPI resources: species, evolution chains and types, fetched as a graph.
+
+A /pokemon payload links to its species and types, a species to its
+evolution chain, and a chain to the species in it. resolve() walks those
+links breadth-first: every wave of not-yet-seen URLs is fetched
+concurrently, so a whole evolution line plus its type data arrives in a
+handful of parallel round-trips instead of a long chain of serial calls.
+
+Resources are cached by URL in their own SQLite cache, projected down to
+the fields used here (like model.Pokemon); concurrent requests for one URL
+share a single call. Pokemon themselves go through utils.lookup and its
+name-keyed cache, so nothing is fetched twice.
+"""
+import os
+import threading
+
+import client
+import metrics
+import utils
+from cache import ResponseCache
+from singleflight import SingleFlight
+
+RESOURCE_CACHE_PATH = os.environ.get("POKEDEX_RESOURCE_CACHE_PATH", ".pokedex_resources.sqlite3")
+# Species, chains and types practically never change
+RESOURCE_TTL = float(os.environ.get("POKEDEX_RESOURCE_TTL", 30 * 24 * 3600))
+
+DAMAGE_RELATIONS = ("double_damage_from", "half_damage_from", "no_damage_from",
+                    "double_damage_to", "half_damage_to", "no_damage_to")
+
+
+def _project_species(data: dict) -> dict:
+    default = next((v["pokemon"]["name"] for v in data.get("varieties", ()) if v.get("is_default")), data["name"])
+    return {
+        "id": data.get("id"),
+        "name": data["name"],
+        "pokemon": default,
+        "evolves_from": (data.get("evolves_from_species") or {}).get("name"),
+        "evolution_chain": (data.get("evolution_chain") or {}).get("url"),
+    }
+
+
+def _project_chain(data: dict) -> dict:
+    def link(node):
+        return {"species": node["species"]["name"], "evolves_to": [link(child) for child in node["evolves_to"]]}
+
+    return {"id": data.get("id"), "chain": link(data["chain"])}
+
+
+def _project_type(data: dict) -> dict:
+    relations = data.get("damage_relations", {})
+    return {
+        "id": data.get("id"),
+        "name": data["name"],
+        "damage_relations": {key: [t["name"] for t in relations.get(key, ())] for key in DAMAGE_RELATIONS},
+    }
+
+
+# Resource kind (the URL path segment after /api/v2/) -> projection of its payload
+PROJECTIONS = {
+    "pokemon-species": _project_species,
+    "evolution-chain": _project_chain,
+    "type": _project_type,
+}
+
+
+def resource_url(kind: str, key) -> str:
+    return f"{utils.POKEAPI_URL}/{kind}/{key}"
+
+
+def split_url(url: str):
+    """(kind, key) of a resource URL; trailing slashes are dropped."""
+    kind, _, key = url.rstrip("/").rpartition("/")
+    return kind.rpartition("/")[2], key
+
+
+def canonical_url(url: str) -> str:
+    return url.rstrip("/")
+
+
+def links(url: str, resource) -> list:
+    """URLs a resource points to that are worth following."""
+    if resource is None:
+        return []
+    kind, _ = split_url(url)
+    if kind == "pokemon":
+        return [resource_url("pokemon-species", resource.species),
+                *(resource_url("type", t) for t in resource.types)]
+    if kind == "pokemon-species":
+        found = [resource_url("pokemon", resource["pokemon"])]
+        if resource["evolution_chain"]:
+            found.append(canonical_url(resource["evolution_chain"]))
+        return found
+    if kind == "evolution-chain":
+        return [resource_url("pokemon-species", species) for species, _, _ in chain_members(resource)]
+    return []
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_flights = SingleFlight()
+
+
+def get_resource_cache() -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(RESOURCE_CACHE_PATH, ttl=RESOURCE_TTL)
+        return _cache
+
+
+def get_resource(url: str):
+    """One linked resource by URL: a Pokemon for /pokemon URLs, else its projected dict; None if missing.
+
+    Network errors (or CircuitOpenError while the API is down) are raised
+    when nothing is cached; a stale entry is served instead otherwise.
+    """
+    url = canonical_url(url)
+    kind, key = split_url(url)
+    if kind == "pokemon":
+        result = utils.lookup(key)
+        if result.error is not None:
+            raise result.error
+        return result.data
+    if kind not in PROJECTIONS:
+        raise ValueError(f"Don't know how to fetch {url}")
+    if utils.OFFLINE:
+        return None
+
+    entry = get_resource_cache().get(url)
+    if entry is not None and entry.is_fresh():
+        metrics.inc("pokedex_resource_lookups_total", kind=kind, result="hit")
+        return entry.data
+    metrics.inc("pokedex_resource_lookups_total", kind=kind, result="miss")
+    return _flights.do(url, lambda: _fetch(url, kind), timeout=utils.SINGLEFLIGHT_TIMEOUT)
+
+
+def _fetch(url: str, kind: str):
+    cache = get_resource_cache()
+    entry, answer = utils.before_upstream(url, cache)
+    if answer is not None:
+        return answer[1]
+    try:
+        response = client.get(url, headers=entry.validators() if entry is not None else {})
+    except client.request_errors():
+        if utils.upstream_failed(entry) is None:
+            raise
+        return entry.data
+
+    status, data, _ = utils.after_upstream(url, entry, response, cache, PROJECTIONS[kind])
+    if data is None and status != 404:
+        response.raise_for_status()
+    return data
+
+
+def resolve(roots, follow=lambda url: True, max_waves=10):
+    """Breadth-first fetch of everything reachable from the root URLs.
+
+    Returns ({url: resource}, {url: exception}) for every URL visited
+    (missing resources map to None). Each wave's new URLs are fetched
+    concurrently on the shared lookup pool; `follow(url)` decides which
+    discovered links are visited at all.
+    """
+    resources, errors = {}, {}
+    seen = set()
+    wave = []
+    for url in roots:
+        url = canonical_url(url)
+        if url not in seen:
+            seen.add(url)
+            wave.append(url)
+
+    def fetch(url):
+        try:
+            return url, get_resource(url), None
+        except utils.network_errors() as e:
+            return url, None, e
+
+    executor = utils._get_executor()
+    for _ in range(max_waves):
+        if not wave:
+            break
+        found = []
+        for url, resource, error in (executor.map(fetch, wave) if len(wave) > 1 else map(fetch, wave)):
+            if error is not None:
+                errors[url] = error
+                continue
+            resources[url] = resource
+            for link in links(url, resource):
+                if link not in seen and follow(link):
+                    seen.add(link)
+                    found.append(link)
+        wave = found
+    return resources, errors
+
+
+def chain_members(chain: dict) -> list:
+    """(species, stage, evolves_from) for every member of an evolution chain, stage 1 first."""
+    members = []
+    level = [(chain["chain"], None)]
+    stage = 1
+    while level:
+        members.extend((node["species"], stage, parent) for node, parent in level)
+        level = [(child, node["species"]) for node, _ in level for child in node["evolves_to"]]
+        stage += 1
+    return members
+
+
+def type_multipliers(types) -> dict:
+    """{attacking type: damage multiplier} against a Pokemon with these type resources.
+
+    Only attacking types that aren't neutral are listed.
+    """
+    multipliers = {}
+    for resource in types:
+        relations = resource["damage_relations"]
+        for key, factor in (("double_damage_from", 2.0), ("half_damage_from", 0.5), ("no_damage_from", 0.0)):
+            for attacker in relations[key]:
+                multipliers[attacker] = multipliers.get(attacker, 1.0) * factor
+    return {attacker: m for attacker, m in multipliers.items() if m != 1.0}
+
+
+class EvolutionLine:
+    """A Pokemon's evolution line with each member's record and type matchups."""
+
+    def __init__(self, pokemon, members, types, errors):
+        self.pokemon = pokemon
+        # (stage, species, evolves_from, Pokemon or None if it couldn't be fetched) in chain order
+        self.members = members
+        self.types = types
+        self.errors = errors
+
+    def matchups(self, member) -> dict:
+        """{attacking type: multiplier} for a member's weaknesses, resistances and immunities."""
+        return type_multipliers([self.types[t] for t in member.types if self.types.get(t)])
+
+
+def evolution_line(pokemon) -> EvolutionLine:
+    """Resolve a Pokemon's whole evolution line, with every member's types, in parallel waves."""
+    root = resource_url("pokemon", pokemon.name)
+    resources, errors = resolve([root])
+    resources[root] = pokemon
+
+    members = []
+    species = resources.get(resource_url("pokemon-species", pokemon.species))
+    chain = resources.get(canonical_url(species["evolution_chain"])) if species and species["evolution_chain"] else None
+    if chain is None:
+        members.append((1, pokemon.species, None, pokemon))
+    else:
+        for name, stage, parent in chain_members(chain):
+            member_species = resources.get(resource_url("pokemon-species", name))
+            member = resources.get(resource_url("pokemon", member_species["pokemon"])) if member_species else None
+            members.append((stage, name, parent, member))
+
+    types = {split_url(url)[1]: resource for url, resource in resources.items() if split_url(url)[0] == "type"}
+    return EvolutionLine(pokemon, members, types, errors)
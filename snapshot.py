@@ -0,0 +1,215 @@
+"""Offline Pokedex snapshot: columnar NumPy arrays plus a small JSON index.
+
+Layout of a snapshot directory:
+
+    meta.json            names, ids, species, artwork URLs, type and ability name tables
+    stats.npy            uint16 (N, 6) base stats in model.STAT_NAMES order
+    types.npy            int8 (N, 2) type ids, -1 for "no second type"
+    ability_ids.npy      int32 ability ids, rows delimited by ability_offsets
+    ability_offsets.npy  int32 (N + 1,)
+
+The .npy files are memory-mapped on load, so opening a snapshot is cheap
+and a lookup is a dict hit plus a few array reads.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+import client
+import utils
+from model import STAT_NAMES, Pokemon
+from ratelimit import TokenBucket
+
+SNAPSHOT_VERSION = 2
+# Version 1 had no species column; its rows read back with species == name
+READABLE_VERSIONS = (1, SNAPSHOT_VERSION)
+
+
+class Snapshot:
+    """Read-only view of a snapshot directory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("version") not in READABLE_VERSIONS:
+            raise ValueError(f"Unsupported snapshot version {meta.get('version')} in {path}")
+        self.version = meta["version"]
+        self.created_at = meta["created_at"]
+        self.names = meta["names"]
+        self.ids = meta["ids"]
+        self.species = meta.get("species") or self.names
+        self.artwork = meta["artwork"]
+        self.type_names = meta["type_names"]
+        self.ability_names = meta["ability_names"]
+        self.stats = np.load(os.path.join(path, "stats.npy"), mmap_mode="r")
+        self.types = np.load(os.path.join(path, "types.npy"), mmap_mode="r")
+        self.ability_ids = np.load(os.path.join(path, "ability_ids.npy"), mmap_mode="r")
+        self.ability_offsets = np.load(os.path.join(path, "ability_offsets.npy"), mmap_mode="r")
+        self.rows = {name: row for row, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.rows
+
+    def get(self, name: str):
+        """Pokemon for a normalized name, or None if the snapshot lacks it."""
+        row = self.rows.get(name)
+        return None if row is None else self.pokemon_at(row)
+
+    def pokemon_at(self, row: int) -> Pokemon:
+        start, end = self.ability_offsets[row], self.ability_offsets[row + 1]
+        return Pokemon(
+            self.ids[row],
+            self.names[row],
+            [self.type_names[t] for t in self.types[row] if t >= 0],
+            [self.ability_names[a] for a in self.ability_ids[start:end]],
+            self.stats[row].tolist(),
+            self.artwork[row],
+            self.species[row],
+        )
+
+    def totals(self) -> np.ndarray:
+        return self.stats.sum(axis=1, dtype=np.int32)
+
+    def rows_with_type(self, type_name: str) -> np.ndarray:
+        """Row numbers of every Pokemon that has the given type."""
+        if type_name not in self.type_names:
+            return np.empty(0, dtype=np.intp)
+        type_id = self.type_names.index(type_name)
+        return np.flatnonzero((self.types == type_id).any(axis=1))
+
+
+def write_snapshot(path: str, pokemon_list) -> Snapshot:
+    """Write Pokemon records as a snapshot directory (atomically replacing path)."""
+    type_names, ability_names = [], []
+    type_ids, ability_lookup = {}, {}
+    stats = np.zeros((len(pokemon_list), len(STAT_NAMES)), dtype=np.uint16)
+    types = np.full((len(pokemon_list), 2), -1, dtype=np.int8)
+    ability_ids, ability_offsets = [], [0]
+
+    for row, pokemon in enumerate(pokemon_list):
+        stats[row] = pokemon.stats
+        for slot, type_name in enumerate(pokemon.types[:2]):
+            if type_name not in type_ids:
+                type_ids[type_name] = len(type_names)
+                type_names.append(type_name)
+            types[row, slot] = type_ids[type_name]
+        for ability in pokemon.abilities:
+            if ability not in ability_lookup:
+                ability_lookup[ability] = len(ability_names)
+                ability_names.append(ability)
+            ability_ids.append(ability_lookup[ability])
+        ability_offsets.append(len(ability_ids))
+
+    tmp_path = path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    np.save(os.path.join(tmp_path, "stats.npy"), stats)
+    np.save(os.path.join(tmp_path, "types.npy"), types)
+    np.save(os.path.join(tmp_path, "ability_ids.npy"), np.array(ability_ids, dtype=np.int32))
+    np.save(os.path.join(tmp_path, "ability_offsets.npy"), np.array(ability_offsets, dtype=np.int32))
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump({
+            "version": SNAPSHOT_VERSION,
+            "created_at": time.time(),
+            "names": [p.name for p in pokemon_list],
+            "ids": [p.id for p in pokemon_list],
+            "species": [p.species for p in pokemon_list],
+            "artwork": [p.artwork for p in pokemon_list],
+            "type_names": type_names,
+            "ability_names": ability_names,
+        }, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    with _loaded_lock:
+        _loaded.pop(path, None)
+    return Snapshot(path)
+
+
+def mirror(path=utils.SNAPSHOT_PATH, base_url=None, rate=10.0, workers=4, limit=None,
+           refresh=False, progress=print) -> Snapshot:
+    """Crawl the full Pokemon list into a snapshot at path.
+
+    Fetched records are appended to `<path>.partial.jsonl` as they arrive, so
+    an interrupted crawl resumes where it stopped. Pokemon already in an
+    existing snapshot are kept unless `refresh` is set, so rerunning only
+    fetches new ones. `limit` only fetches the first N listed Pokemon, keeping
+    the rest of an existing snapshot. `rate` caps requests per second across
+    all workers.
+    """
+    base_url = base_url or utils.POKEAPI_URL
+    listed = utils.fetch_pokemon_names(base_url)
+    names = listed[:limit] if limit else listed
+
+    partial_path = path + ".partial.jsonl"
+    done, kept = {}, {}
+    if os.path.exists(os.path.join(path, "meta.json")):
+        existing = Snapshot(path)
+        if existing.version == SNAPSHOT_VERSION:  # older ones lack fields; fetch everything again
+            kept = {name: existing.pokemon_at(row) for name, row in existing.rows.items()}
+    if not refresh:
+        done.update(kept)
+    if os.path.exists(partial_path):
+        with open(partial_path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    done[record["name"]] = Pokemon.from_dict(record)
+    todo = [name for name in names if name not in done]
+    progress(f"📦 {len(names)} Pokemon listed, {len(done)} already mirrored, {len(todo)} to fetch")
+
+    throttle = TokenBucket(rate, burst=1)
+
+    def fetch_one(name):
+        throttle.acquire()
+        response = client.get(f"{base_url}/pokemon/{name}")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return Pokemon.from_api(response.json())
+
+    with open(partial_path, "a") as f, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch_one, name) for name in todo]
+        try:
+            for count, future in enumerate(as_completed(futures), 1):
+                pokemon = future.result()
+                if pokemon is not None:
+                    done[pokemon.name] = pokemon
+                    f.write(pokemon.dumps() + "\n")
+                    f.flush()
+                if count % 100 == 0:
+                    progress(f"   ... {count}/{len(todo)}")
+        except BaseException:
+            # Keep what we have on disk and stop queued fetches; rerun to resume
+            for future in futures:
+                future.cancel()
+            raise
+
+    # A limited run only narrows what is fetched; the rest of an existing snapshot stays
+    if limit:
+        done = {**kept, **done}
+    snapshot = write_snapshot(path, [done[name] for name in listed if name in done])
+    os.remove(partial_path)
+    progress(f"✅ Snapshot with {len(snapshot)} Pokemon written to {path}")
+    return snapshot
+
+
+_loaded = {}
+_loaded_lock = threading.Lock()
+
+
+def load_snapshot(path: str) -> Snapshot:
+    """Open a snapshot once per process and share it."""
+    with _loaded_lock:
+        snapshot = _loaded.get(path)
+        if snapshot is None:
+            snapshot = _loaded[path] = Snapshot(path)
+        return snapshot
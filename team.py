@@ -0,0 +1,124 @@
+"""Six-versus-six team battles scored by base-stat total, vectorized with NumPy.
+
+Each trainer brings up to six Pokemon. All of them are fetched as one
+deduplicated concurrent batch, and every cross pairing is decided like
+pokemon.compare_pokemons (the higher total wins) from one broadcast
+subtraction over the two teams' stats matrices. Lineup analysis scores all
+orderings of a team (6! = 720 at most) against the other one in a single
+fancy-indexing pass instead of a Python loop per pairing.
+"""
+from itertools import permutations
+
+import numpy as np
+
+from model import STAT_NAMES
+from utils import get_many_pokemon
+
+TEAM_SIZE = 6
+
+
+class TeamBattle:
+    """All cross pairings between two teams.
+
+    `results[i, j]` is 1 when team 1's i-th Pokemon beats team 2's j-th,
+    -1 when it loses and 0 for a tie; `margins[i, j]` is the difference
+    in total stats.
+    """
+
+    def __init__(self, names1, stats1, names2, stats2):
+        self.names1, self.names2 = list(names1), list(names2)
+        self.stats1 = np.asarray(stats1, dtype=np.int32).reshape(len(self.names1), len(STAT_NAMES))
+        self.stats2 = np.asarray(stats2, dtype=np.int32).reshape(len(self.names2), len(STAT_NAMES))
+        self.totals1 = self.stats1.sum(axis=1)
+        self.totals2 = self.stats2.sum(axis=1)
+        self.margins = self.totals1[:, None] - self.totals2[None, :]
+        self.results = np.sign(self.margins).astype(np.int8)
+
+    @property
+    def empty_teams(self) -> list:
+        """Numbers (1, 2) of the teams left without a single Pokemon."""
+        return [side for side, names in ((1, self.names1), (2, self.names2)) if not names]
+
+    @property
+    def pairings(self) -> int:
+        return self.results.size
+
+    @property
+    def wins(self):
+        """(team 1 wins, team 2 wins, ties) over every cross pairing."""
+        wins = int(np.count_nonzero(self.results == 1))
+        losses = int(np.count_nonzero(self.results == -1))
+        return wins, losses, self.pairings - wins - losses
+
+    @property
+    def winner(self):
+        """1 or 2 for the team winning more cross pairings (total stats break ties), else None."""
+        wins, losses, _ = self.wins
+        if wins == losses:
+            wins, losses = int(self.totals1.sum()), int(self.totals2.sum())
+        return 1 if wins > losses else 2 if losses > wins else None
+
+    @property
+    def size(self) -> int:
+        """How many one-on-one matches a lineup has: the smaller team's size."""
+        return min(len(self.names1), len(self.names2))
+
+    def lineup_score(self, order1=None, order2=None):
+        """(team 1 wins, team 2 wins, ties) when the teams meet one-on-one in these orders."""
+        k = self.size
+        order1 = np.arange(k) if order1 is None else np.asarray(order1)[:k]
+        order2 = np.arange(k) if order2 is None else np.asarray(order2)[:k]
+        matches = self.results[order1, order2]
+        wins, losses = int(np.count_nonzero(matches == 1)), int(np.count_nonzero(matches == -1))
+        return wins, losses, k - wins - losses
+
+    def best_lineup(self, side=1):
+        """The ordering of one team that does best against the other team as entered.
+
+        Returns (order, (wins, losses, ties)) from that team's side: indices
+        into its names, scored by wins minus losses, then total margin.
+        """
+        results, margins = (self.results, self.margins) if side == 1 else (-self.results.T, -self.margins.T)
+        k = self.size
+        if k == 0:
+            return [], (0, 0, 0)
+        orders = np.array(list(permutations(range(len(results)), k)), dtype=np.intp)
+        # (orderings x k) outcomes of every ordering against the other side's first k
+        matches = results[orders, np.arange(k)]
+        score = matches.sum(axis=1, dtype=np.int64)
+        margin = margins[orders, np.arange(k)].sum(axis=1, dtype=np.int64)
+        # Lexicographic (score, margin): margins are bounded by k * 6 * 255 per ordering
+        best = int(np.argmax(score * (2 * k * 6 * 255 + 1) + margin))
+        wins, losses = int(np.count_nonzero(matches[best] == 1)), int(np.count_nonzero(matches[best] == -1))
+        return orders[best].tolist(), (wins, losses, k - wins - losses)
+
+    def matrix(self):
+        """Rows of (team 1 name, {team 2 name: margin}) for display."""
+        return [(name, dict(zip(self.names2, row.tolist()))) for name, row in zip(self.names1, self.margins)]
+
+
+def from_names(names1, names2):
+    """Team battle between two lists of names, fetched as one concurrent batch.
+
+    Each team keeps at most TEAM_SIZE Pokemon; duplicates within a team are
+    dropped. Returns (battle, failed) where failed lists the LookupResults
+    that could not be fetched; see battle.empty_teams for a team that lost
+    every Pokemon that way.
+    """
+    names1, names2 = list(names1)[:TEAM_SIZE], list(names2)[:TEAM_SIZE]
+    results = get_many_pokemon(names1 + names2)
+    failed, teams = [], ([], [])
+    for side, batch in enumerate((results[:len(names1)], results[len(names1):])):
+        seen = set()
+        for result in batch:
+            if not result.ok:
+                failed.append(result)
+            elif result.name not in seen:
+                seen.add(result.name)
+                teams[side].append(result.data)
+
+    def stats(team):
+        return np.array([p.stats for p in team], dtype=np.int32).reshape(len(team), len(STAT_NAMES))
+
+    team1, team2 = teams
+    return TeamBattle([p.name for p in team1], stats(team1), [p.name for p in team2], stats(team2)), failed
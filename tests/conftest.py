@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.common import isolated
+from benchmarks.fake_pokeapi import FakePokeAPI
+
+
+@pytest.fixture
+def api():
+    """A local fake PokeAPI with a small roster."""
+    with FakePokeAPI(roster_size=20) as server:
+        yield server
+
+
+@pytest.fixture
+def isolated_api(api):
+    """utils pointed at the fake API with fresh temporary caches; yields the API."""
+    with isolated(api):
+        yield api
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import aio
+import aioclient
+import ratelimit
+from benchmarks.common import isolated
+from benchmarks.fake_pokeapi import FakePokeAPI
+
+
+async def longest_stall(coroutine, interval=0.01):
+    """Run a coroutine while a ticker measures the longest gap between its ticks."""
+    gaps = []
+
+    async def tick():
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    ticker = asyncio.create_task(tick())
+    try:
+        result = await coroutine
+    finally:
+        ticker.cancel()
+    return result, max(gaps, default=0.0)
+
+
+def test_cold_lookups_do_not_block_the_event_loop():
+    with FakePokeAPI(roster_size=20, latency=0.3) as api, isolated(api, name_index=False):
+        results, stall = asyncio.run(longest_stall(aio.get_many_pokemon(["pikachu", "charizard", "missingno"])))
+    assert [result.status for result in results] == [200, 200, 404]
+    # The name list and each lookup take 0.3 s upstream; none of it may hold the loop
+    assert stall < 0.15
+
+
+def test_async_requests_respect_the_concurrency_limit(api):
+    limiter = ratelimit.configure(api.url, rate=0, initial=2, maximum=2)
+    api.latency = 0.05
+    peak = []
+
+    async def run():
+        async def watch():
+            while True:
+                peak.append(limiter.concurrency.in_flight)
+                await asyncio.sleep(0.005)
+
+        watcher = asyncio.create_task(watch())
+        try:
+            return await asyncio.gather(*(aioclient.get(f"{api.url}/pokemon/{name}") for name in api.roster[:10]))
+        finally:
+            watcher.cancel()
+            aioclient.get_session().close()
+
+    try:
+        responses = asyncio.run(run())
+    finally:
+        ratelimit.configure(api.url)
+    assert [response.status_code for response in responses] == [200] * 10
+    assert max(peak) <= 2
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_cancelled_requests_give_their_slot_back(api):
+    limiter = ratelimit.configure(api.url, rate=0, initial=2, maximum=2)
+    api.latency = 0.5
+
+    async def run():
+        try:
+            await asyncio.wait_for(aioclient.get(f"{api.url}/pokemon/pikachu"), 0.05)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            aioclient.get_session().close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        ratelimit.configure(api.url)
+    assert limiter.concurrency.in_flight == 0
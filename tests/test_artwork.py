@@ -0,0 +1,30 @@
+import os
+
+import pytest
+from PIL import Image
+
+import artwork
+
+
+@pytest.fixture
+def artwork_url(isolated_api):
+    return f"{isolated_api.url}/artwork/1.png"
+
+
+def test_variants_are_cached_on_disk(isolated_api, artwork_url):
+    path = artwork.get_artwork(artwork_url)
+    assert path == artwork.variant_path(artwork_url, "card") and os.path.exists(path)
+    hits = isolated_api.hits
+    assert artwork.get_artwork(artwork_url, "thumb") == artwork.variant_path(artwork_url, "thumb")
+    assert isolated_api.hits == hits
+
+
+@pytest.mark.parametrize("error", [OSError(28, "No space left on device"),
+                                   Image.DecompressionBombError("too many pixels")])
+def test_save_and_decode_errors_fall_back_to_the_remote_url(isolated_api, artwork_url, monkeypatch, error):
+    def fail(url, image):
+        raise error
+
+    monkeypatch.setattr(artwork, "_save_variants", fail)
+    assert artwork.get_artwork(artwork_url) is None
+    assert artwork.artwork_url(artwork_url) == artwork_url
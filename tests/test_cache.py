@@ -0,0 +1,46 @@
+import time
+
+import cache
+import utils
+
+
+def test_memory_hits_keep_entries_from_being_evicted(tmp_path):
+    responses = cache.ResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=3, memory_entries=3)
+    for key in ("pikachu", "charizard", "lucario"):
+        responses.put(key, {"name": key})
+        time.sleep(0.01)
+    for _ in range(5):
+        assert responses.get("pikachu").data == {"name": "pikachu"}  # served from memory
+    responses.put("mewtwo", {"name": "mewtwo"})
+    keys = {key for key, in responses._conn.execute("SELECT key FROM responses")}
+    assert keys == {"pikachu", "lucario", "mewtwo"}
+
+
+def test_entries_expire_after_their_ttl(tmp_path):
+    responses = cache.ResponseCache(str(tmp_path / "cache.sqlite3"), ttl=0.05, negative_ttl=0.05)
+    responses.put("pikachu", {"name": "pikachu"}, etag='"v1"')
+    responses.put_missing("missingno")
+    assert responses.get("pikachu").is_fresh() and responses.get("missingno").is_fresh()
+    time.sleep(0.1)
+    stale = responses.get("pikachu")
+    assert not stale.is_fresh() and stale.data == {"name": "pikachu"}
+    assert stale.validators() == {"If-None-Match": '"v1"'}
+    assert not responses.get("missingno").is_fresh()
+    assert responses.refresh("pikachu", stale).is_fresh()
+
+
+def test_stale_entries_are_served_and_revalidated(isolated_api):
+    cache.get_cache().ttl = 0.05
+    assert utils.lookup("pikachu").status == 200
+    hits = isolated_api.hits
+    assert not utils.lookup("pikachu").stale
+    assert isolated_api.hits == hits  # fresh: no request
+
+    time.sleep(0.1)
+    result = utils.lookup("pikachu")
+    assert result.stale and result.data.name == "pikachu"
+    deadline = time.monotonic() + 5
+    while not cache.get_cache().get("pikachu").is_fresh() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get_cache().get("pikachu").is_fresh()
+    assert isolated_api.hits == hits + 1  # one conditional request, answered 304
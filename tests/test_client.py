@@ -0,0 +1,61 @@
+import pytest
+import requests
+
+import client
+import ratelimit
+
+
+class FailingSession:
+    """Stands in for the pooled session, raising the given error on every GET."""
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+@pytest.fixture
+def limiter():
+    url = "http://stub.invalid/api/v2/pokemon/pikachu"
+    yield url, ratelimit.configure(url, rate=0, initial=3, maximum=3)
+    ratelimit.configure(url)
+
+
+@pytest.mark.parametrize("error", [
+    requests.exceptions.ChunkedEncodingError("broken body"),
+    requests.exceptions.ContentDecodingError("bad gzip"),
+    requests.exceptions.TooManyRedirects("loop"),
+    requests.exceptions.InvalidURL("nope"),
+])
+def test_request_errors_free_the_slot(monkeypatch, limiter, error):
+    url, host_limiter = limiter
+    session = FailingSession(error)
+    monkeypatch.setattr(client, "get_session", lambda: session)
+    for _ in range(5):
+        with pytest.raises(type(error)):
+            client.get(url, retries=2)
+    # Not retried, and no slot leaked: more failures than the limit never block
+    assert session.calls == 5
+    assert host_limiter.concurrency.in_flight == 0
+
+
+def test_connection_errors_are_retried_then_raised(monkeypatch, limiter):
+    url, host_limiter = limiter
+    session = FailingSession(requests.exceptions.ConnectionError("refused"))
+    monkeypatch.setattr(client, "get_session", lambda: session)
+    monkeypatch.setattr(client, "backoff_delay", lambda attempt: 0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get(url, retries=2)
+    assert session.calls == 3
+    assert host_limiter.concurrency.in_flight == 0
+
+
+def test_other_exceptions_free_the_slot(monkeypatch, limiter):
+    url, host_limiter = limiter
+    monkeypatch.setattr(client, "get_session", lambda: FailingSession(KeyboardInterrupt()))
+    with pytest.raises(KeyboardInterrupt):
+        client.get(url)
+    assert host_limiter.concurrency.in_flight == 0
@@ -0,0 +1,53 @@
+import sqlite3
+
+import history
+
+
+def test_a_locked_database_is_retried(tmp_path, monkeypatch):
+    battles = history.BattleHistory(str(tmp_path / "history.sqlite3"), flush_interval=0.01)
+    write = battles._write
+    failures = []
+
+    def flaky_write(batch):
+        if not failures:
+            failures.append(batch)
+            raise sqlite3.OperationalError("database is locked")
+        write(batch)
+
+    monkeypatch.setattr(battles, "_write", flaky_write)
+    battles.record("pikachu", "charizard", 320, 534)
+    battles.flush()
+    assert failures and len(battles) == 1
+    battles.close()
+
+
+def test_the_writer_survives_a_failed_batch(tmp_path, monkeypatch, capsys):
+    battles = history.BattleHistory(str(tmp_path / "history.sqlite3"), flush_interval=0.01)
+    write = battles._write
+
+    def locked(batch):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(battles, "_write", locked)
+    battles.record("pikachu", "charizard", 320, 534)
+    battles.flush()  # returns instead of hanging
+    assert "Could not save 1 battles" in capsys.readouterr().out
+
+    monkeypatch.setattr(battles, "_write", write)
+    battles.record("lucario", "charizard", 525, 534)
+    battles.flush()
+    assert len(battles) == 1
+    assert battles.record_for("charizard") == (1, 1, 0, 0)
+    battles.close()
+
+
+def test_aggregates_follow_the_battles(tmp_path):
+    battles = history.BattleHistory(str(tmp_path / "history.sqlite3"), flush_interval=0.01)
+    battles.record("pikachu", "charizard", 320, 534)
+    battles.record("charizard", "pikachu", 534, 320)
+    battles.record("pikachu", "raichu", 320, 320)
+    battles.flush()
+    assert battles.head_to_head("pikachu", "charizard") == (0, 2, 0)
+    assert battles.leaderboard(1)[0][:4] == (1, "charizard", 2, 2)
+    assert battles.record_for("pikachu") == (3, 0, 2, 1)
+    battles.close()
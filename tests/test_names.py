@@ -0,0 +1,22 @@
+import os
+
+import names
+import utils
+from benchmarks.common import isolated
+
+
+def test_isolated_name_list_stays_in_the_temporary_directory(api, monkeypatch, tmp_path):
+    real_path = tmp_path / "real_names.json"
+    monkeypatch.setattr(names, "NAMES_PATH", str(real_path))
+    with isolated(api, name_index=False) as tmp_dir:
+        assert "pikachu" in utils.get_name_index()
+        assert os.path.exists(os.path.join(tmp_dir, "names.json"))
+    assert not real_path.exists()
+    assert names.NAMES_PATH == str(real_path)
+
+
+def test_names_path_is_read_at_call_time(monkeypatch, tmp_path):
+    monkeypatch.setattr(names, "NAMES_PATH", str(tmp_path / "names.json"))
+    names.save_names(["pikachu", "mewtwo"])
+    assert names.load_names() == ["pikachu", "mewtwo"]
+    assert names.load_names(ttl=-1) is None
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pokemon
+import snapshot
+import utils
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DISPLAY = """
+import sys
+import pokemon
+from model import Pokemon
+pokemon.display_pokemon_info(Pokemon(25, "pikachu", ["electric"], ["static"], [35, 55, 40, 50, 50, 90]))
+print("numpy" in sys.modules)
+"""
+
+
+def test_display_without_a_snapshot_does_not_import_numpy(tmp_path):
+    env = dict(os.environ, POKEDEX_SNAPSHOT=str(tmp_path / "snapshot"), POKEDEX_RANKS_PATH=str(tmp_path / "ranks.npz"))
+    out = subprocess.run([sys.executable, "-c", DISPLAY], cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+                         check=True).stdout
+    assert "TOTAL POWER: 320\n" in out
+    assert out.splitlines()[-1] == "False"
+
+
+def test_display_ranks_against_the_snapshot(isolated_api, capsys):
+    snapshot.mirror(utils.SNAPSHOT_PATH, base_url=isolated_api.url, rate=0, progress=lambda message: None)
+    total = pokemon.display_pokemon_info(utils.get_snapshot().get("pikachu"))
+    out = capsys.readouterr().out
+    assert f"TOTAL POWER: {total} (" in out
+    assert f"of {len(isolated_api.roster):,}, #" in out
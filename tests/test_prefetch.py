@@ -0,0 +1,17 @@
+import utils
+
+
+def test_a_failing_warm_up_does_not_fail_the_lookup(isolated_api):
+    def warm(result):
+        raise OSError(30, "Read-only file system")
+
+    result = utils.prefetch("pikachu", warm=warm).result(timeout=10)
+    assert result.ok and result.data.name == "pikachu"
+
+
+def test_prefetches_of_one_name_share_a_lookup(isolated_api):
+    isolated_api.latency = 0.2
+    first, second = utils.prefetch("charizard"), utils.prefetch(" Charizard ")
+    assert first is second
+    assert first.result(timeout=10).data.name == "charizard"
+    assert utils.prefetch("missingno") is None
@@ -0,0 +1,31 @@
+import os
+import time
+
+import ranks
+import snapshot
+import utils
+
+
+def test_no_placement_without_a_snapshot(isolated_api):
+    pokemon = utils.lookup("pikachu").data
+    assert ranks.placements(pokemon) == {}
+
+
+def test_placements_rank_against_the_snapshot(isolated_api):
+    snapshot.mirror(utils.SNAPSHOT_PATH, base_url=isolated_api.url, rate=0, progress=lambda message: None)
+    pokemon = utils.get_snapshot().get("pikachu")
+    placements = ranks.placements(pokemon)
+    assert set(placements) == set(ranks.COLUMNS)
+    assert placements["total"].count == len(isolated_api.roster)
+    higher = sum(int(total) > pokemon.total for total in utils.get_snapshot().totals())
+    assert placements["total"].rank == higher + 1
+
+
+def test_the_index_is_saved_in_the_background(isolated_api):
+    snapshot.mirror(utils.SNAPSHOT_PATH, base_url=isolated_api.url, rate=0, progress=lambda message: None)
+    ranks.placements(utils.get_snapshot().get("pikachu"))
+    deadline = time.monotonic() + 5
+    while not os.path.exists(ranks.RANKS_PATH) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    saved = ranks.load_index()
+    assert saved is not None and len(saved) == len(isolated_api.roster)
@@ -0,0 +1,54 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import client
+import ratelimit
+from benchmarks.fake_pokeapi import FakePokeAPI
+
+
+def test_429_halves_the_limit_once_per_round_trip():
+    limiter = ratelimit.AdaptiveLimiter(initial=8, maximum=16, latency_target=1.0)
+    for _ in range(3):
+        limiter.acquire()
+    for _ in range(3):
+        limiter.release(0.05, throttled=True)
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_fast_responses_grow_the_limit():
+    limiter = ratelimit.AdaptiveLimiter(initial=2, maximum=4, latency_target=1.0)
+    for _ in range(50):
+        limiter.acquire()
+        limiter.release(0.01)
+    assert limiter.limit == 4
+
+
+def test_throttled_responses_shrink_the_host_limit():
+    with FakePokeAPI(roster_size=5, rate_limit=1) as api:
+        limiter = ratelimit.configure(api.url, rate=0, initial=8, maximum=8)
+        try:
+            statuses = [client.get(f"{api.url}/pokemon/pikachu", retries=0).status_code for _ in range(3)]
+        finally:
+            ratelimit.configure(api.url)
+    assert statuses == [200, 429, 429]
+    assert limiter.throttled == 2
+    assert limiter.concurrency.limit < 8
+
+
+def test_token_bucket_keeps_a_burst_under_the_upstream_ceiling():
+    ceiling, rate, requests = 40, 34, 120
+    with FakePokeAPI(roster_size=20, latency=0.02, rate_limit=ceiling) as api:
+        ratelimit.configure(api.url, rate=rate, burst=4, maximum=16)
+        urls = [f"{api.url}/pokemon/{api.roster[i % len(api.roster)]}" for i in range(requests)]
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                statuses = list(pool.map(lambda url: client.get(url, retries=0).status_code, urls))
+            elapsed = time.perf_counter() - start
+        finally:
+            ratelimit.configure(api.url)
+    assert api.throttled <= 1
+    assert statuses.count(200) >= requests - 1
+    # Close to the configured rate: the burst allowance on top, Retry-After stalls none
+    assert rate * 0.8 <= requests / elapsed <= rate * 1.2
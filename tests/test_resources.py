@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+import resources
+import utils
+
+
+def test_evolution_line_resolves_members_and_types(isolated_api):
+    pokemon = utils.lookup(isolated_api.lines[0][0]).data
+    line = resources.evolution_line(pokemon)
+    assert not line.errors
+    assert [name for _, name, _, _ in line.members] == isolated_api.lines[0]
+    assert all(member is not None for _, _, _, member in line.members)
+    assert set(pokemon.types) <= set(line.types)
+
+
+def test_resources_are_revalidated_and_served_stale_while_the_api_fails(isolated_api):
+    url = resources.resource_url("type", "fire")
+    resources.get_resource_cache().ttl = 0.05
+    fire = resources.get_resource(url)
+    assert fire["name"] == "fire"
+
+    time.sleep(0.1)
+    paths = len(isolated_api.paths)
+    assert resources.get_resource(url) == fire  # 304
+    assert len(isolated_api.paths) == paths + 1
+
+    time.sleep(0.1)
+    isolated_api.error_rate = 1.0
+    assert resources.get_resource(url) == fire
+
+
+def test_a_failing_api_with_nothing_cached_raises(isolated_api):
+    isolated_api.error_rate = 1.0
+    with pytest.raises(utils.network_errors()):
+        resources.get_resource(resources.resource_url("type", "water"))
+    assert resources.get_resource_cache().get(resources.resource_url("type", "water")) is None
@@ -0,0 +1,75 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import utils
+from singleflight import SingleFlight
+
+
+def run_together(count, fn):
+    """Call fn() from `count` threads at once; return (results, errors)."""
+    start = threading.Barrier(count)
+
+    def call(_):
+        start.wait()
+        try:
+            return fn(), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        outcomes = list(pool.map(call, range(count)))
+    return [result for result, _ in outcomes], [error for _, error in outcomes]
+
+
+def test_concurrent_calls_share_one_run():
+    flights, calls = SingleFlight(), []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "pikachu"
+
+    results, errors = run_together(20, lambda: flights.do("pikachu", slow))
+    assert results == ["pikachu"] * 20 and errors == [None] * 20
+    assert len(calls) == 1
+    assert flights.in_flight() == 0
+
+
+def test_an_error_reaches_every_waiter_and_the_next_call_retries():
+    flights, calls = SingleFlight(), []
+
+    def failing():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ConnectionError("PokeAPI is down")
+
+    _, errors = run_together(10, lambda: flights.do("pikachu", failing))
+    assert len(calls) == 1
+    assert all(isinstance(e, ConnectionError) for e in errors)
+    assert flights.do("pikachu", lambda: "pikachu") == "pikachu"
+
+
+def test_waiters_time_out_while_the_leader_finishes():
+    flights = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flights.do, args=("pikachu", lambda: release.wait(5)))
+    leader.start()
+    while not flights.in_flight():
+        time.sleep(0.001)
+    with pytest.raises(TimeoutError):
+        flights.do("pikachu", lambda: "not called", timeout=0.05)
+    release.set()
+    leader.join(5)
+    assert flights.in_flight() == 0
+
+
+def test_concurrent_lookups_make_one_request_per_name(isolated_api):
+    isolated_api.latency = 0.2
+    names = isolated_api.roster[:3]
+    results, errors = run_together(30, lambda: [utils.lookup(name) for name in names])
+    assert errors == [None] * 30
+    assert all([r.data.name for r in lookups] == names for lookups in results)
+    assert isolated_api.hits == len(names)
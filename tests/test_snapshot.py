@@ -0,0 +1,63 @@
+import json
+import os
+
+import snapshot
+from model import Pokemon
+
+GIRATINA = Pokemon(487, "giratina-altered", ["ghost", "dragon"], ["pressure", "telepathy"],
+                   [150, 100, 120, 100, 120, 90], "https://example.invalid/487.png", species="giratina")
+PIKACHU = Pokemon(25, "pikachu", ["electric"], ["static", "lightning-rod"], [35, 55, 40, 50, 50, 90])
+
+
+def test_snapshot_round_trips_every_field(tmp_path):
+    path = str(tmp_path / "snapshot")
+    written = snapshot.write_snapshot(path, [GIRATINA, PIKACHU])
+    for pokemon in (GIRATINA, PIKACHU):
+        assert snapshot.Snapshot(path).get(pokemon.name).to_dict() == pokemon.to_dict()
+    assert written.get("giratina-altered").species == "giratina"
+
+
+def test_version_1_snapshots_still_load(tmp_path):
+    path = str(tmp_path / "snapshot")
+    snapshot.write_snapshot(path, [GIRATINA])
+    meta_path = os.path.join(path, "meta.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta["version"] = 1
+    del meta["species"]
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    old = snapshot.Snapshot(path)
+    assert old.version == 1
+    assert old.get("giratina-altered").species == "giratina-altered"
+
+
+def test_mirror_fetches_everything_from_the_fake_api(isolated_api, tmp_path):
+    path = str(tmp_path / "snapshot")
+    mirrored = snapshot.mirror(path, base_url=isolated_api.url, rate=0, progress=lambda message: None)
+    assert mirrored.names == isolated_api.roster
+    assert not os.path.exists(path + ".partial.jsonl")
+
+    hits = isolated_api.hits
+    snapshot.mirror(path, base_url=isolated_api.url, rate=0, progress=lambda message: None)
+    assert isolated_api.hits == hits + 1  # only the name list: everything is mirrored already
+
+
+def test_limited_mirror_keeps_the_existing_snapshot(isolated_api, tmp_path):
+    path = str(tmp_path / "snapshot")
+    snapshot.mirror(path, base_url=isolated_api.url, rate=0, progress=lambda message: None)
+    limited = snapshot.mirror(path, base_url=isolated_api.url, rate=0, limit=3, refresh=True,
+                              progress=lambda message: None)
+    assert limited.names == isolated_api.roster
+
+
+def test_offline_lookups_are_served_from_the_snapshot(isolated_api, monkeypatch):
+    import utils
+
+    snapshot.mirror(utils.SNAPSHOT_PATH, base_url=isolated_api.url, rate=0, progress=lambda message: None)
+    monkeypatch.setattr(utils, "OFFLINE", True)
+    hits = isolated_api.hits
+    result = utils.lookup("charizard")
+    assert result.status == 200 and result.data.name == "charizard"
+    assert utils.lookup("missingno").status == 404
+    assert isolated_api.hits == hits
@@ -0,0 +1,16 @@
+import team
+
+
+def test_best_lineup_beats_the_order_as_entered():
+    battle = team.TeamBattle(["a", "b", "c"], [[10] * 6, [20] * 6, [30] * 6],
+                             ["x", "y", "z"], [[15] * 6, [25] * 6, [35] * 6])
+    assert battle.lineup_score() == (0, 3, 0)
+    order, score = battle.best_lineup(1)
+    assert score == (2, 1, 0)
+
+
+def test_a_team_with_no_pokemon_found_is_reported(isolated_api):
+    battle, failed = team.from_names(["pikachuu", "mewtwoo"], ["charizard"])
+    assert battle.empty_teams == [1]
+    assert battle.names2 == ["charizard"]
+    assert [failure.name for failure in failed] == ["pikachuu", "mewtwoo"]
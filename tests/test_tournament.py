@@ -0,0 +1,37 @@
+import numpy as np
+
+import tournament
+
+
+def test_round_robin_follows_the_totals():
+    result = tournament.Tournament(["a", "b", "c"], [[10] * 6, [20] * 6, [10] * 6])
+    assert result.record("b") == (2, 0, 0)
+    assert result.record("a") == (0, 1, 1)
+    assert result.matchups == 3
+    assert [row[1] for row in result.standings()][0] == "b"
+
+
+def test_no_names_found_gives_an_empty_tournament(isolated_api):
+    result, failed = tournament.from_names(["pikachuu", "charizzard"])
+    assert len(result) == 0 and result.standings() == []
+    assert [failure.name for failure in failed] == ["pikachuu", "charizzard"]
+
+
+def test_lookup_errors_are_reported_not_raised(isolated_api, monkeypatch):
+    import utils
+
+    monkeypatch.setattr(utils, "POKEAPI_URL", "http://127.0.0.1:9/api/v2")
+    result, failed = tournament.from_names(["pikachu", "charizard"])
+    assert len(result) == 0 and len(failed) == 2
+    assert all(failure.error is not None for failure in failed)
+    assert np.shape(result.stats) == (0, 6)
+
+
+def test_elo_order_does_not_depend_on_the_round_count():
+    stats = np.random.default_rng(0).integers(20, 160, size=(200, 6))
+    result = tournament.Tournament([str(i) for i in range(200)], stats)
+    scores = result.wins + 0.5 * result.ties
+    by_score = np.argsort(-scores, kind="stable")
+    for rounds in (1, tournament.ELO_ROUNDS, 100):
+        ratings = tournament.elo_ratings(result.results, rounds=rounds)
+        assert np.all(np.diff(ratings[by_score]) <= 1e-6)
@@ -1,13 +1,380 @@
-import requests
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+import client
+import metrics
+import names
+from cache import get_cache
+from circuit import CircuitBreaker, CircuitOpenError
+from model import Pokemon
+from singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+POKEAPI_URL = os.environ.get("POKEAPI_URL", "https://pokeapi.co/api/v2")
+MAX_WORKERS = int(os.environ.get("POKEAPI_MAX_WORKERS", 8))
+# How long a caller waits on another caller's in-flight request for the same name
+SINGLEFLIGHT_TIMEOUT = float(os.environ.get("POKEAPI_SINGLEFLIGHT_TIMEOUT", 30))
+
+# Offline Pokedex snapshot (see snapshot.py); POKEDEX_OFFLINE=1 never calls the API
+SNAPSHOT_PATH = os.environ.get("POKEDEX_SNAPSHOT", "pokedex_snapshot")
+OFFLINE = os.environ.get("POKEDEX_OFFLINE", "") not in ("", "0")
+
+
+class LookupResult(NamedTuple):
+    """Outcome of one lookup: data on success, otherwise the status or error."""
+    name: str
+    status: Optional[int]
+    data: Optional[Pokemon]
+    error: Optional[Exception] = None
+    suggestions: tuple = ()
+    stale: bool = False  # served from an expired cache entry (refreshing, or the API is down)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 200 and self.data is not None
+
+
+def normalize_name(pokemon_name: str) -> str:
+    """Strip whitespace and convert to lowercase, the form the API and cache use."""
+    return pokemon_name.strip().lower()
+
+
+def get_snapshot():
+    """The mirrored snapshot if there is one, else None.
+
+    snapshot.py (and NumPy) is only imported once a snapshot exists.
+    """
+    if not os.path.exists(os.path.join(SNAPSHOT_PATH, "meta.json")):
+        return None
+    from snapshot import load_snapshot
+    return load_snapshot(SNAPSHOT_PATH)
+
+
+def fetch_pokemon_names(base_url=None, page_size=500):
+    """Every Pokemon name from the paginated /pokemon list endpoint."""
+    url = f"{base_url or POKEAPI_URL}/pokemon?limit={page_size}&offset=0"
+    names = []
+    while url:
+        response = client.get(url)
+        response.raise_for_status()
+        page = response.json()
+        names.extend(result["name"] for result in page["results"])
+        url = page.get("next")
+    return names
+
+
+_flights = SingleFlight()
+
+_name_index = None
+_name_index_failed_at = 0.0
+_name_index_lock = threading.Lock()
+
+
+def get_name_index():
+    """Index of every Pokemon name, or None if the list can't be loaded right now.
+
+    Names come from the on-disk names file or one call to the list endpoint
+    (saved for next time). Offline, or when the API is unreachable, the
+    offline snapshot's names are used instead.
+    """
+    global _name_index, _name_index_failed_at
+    if _name_index is not None:
+        return _name_index
+    with _name_index_lock:
+        if _name_index is None and time.time() - _name_index_failed_at > 60:
+            all_names = None if OFFLINE else names.load_names()
+            if all_names is None and not OFFLINE:
+                try:
+                    all_names = fetch_pokemon_names(page_size=100_000)
+                    names.save_names(all_names)
+                except (*network_errors(), OSError, ValueError) as e:
+                    print(f"Could not load the Pokemon name list: {e}")
+            if all_names is None and get_snapshot() is not None:
+                all_names = get_snapshot().names
+            if all_names:
+                _name_index = names.NameIndex(all_names)
+            else:
+                _name_index_failed_at = time.time()
+        return _name_index
+
+
+def is_known_name(pokemon_name: str) -> bool:
+    """False only when the local name index is sure the name doesn't exist."""
+    clean_name = normalize_name(pokemon_name)
+    index = get_name_index()
+    return bool(clean_name) and (index is None or clean_name.isdigit() or clean_name in index)
+
+
+def fetch_pokemon(clean_name: str):
+    """Look up a normalized name through the cache, returning (status_code, Pokemon, stale).
+
+    Fresh cache entries (including remembered 404s) are served locally.
+    Stale Pokemon are served immediately too, while a background refresh
+    revalidates them with ETag/Last-Modified. Names found in the offline
+    snapshot never touch the network, and concurrent misses for the same name
+    are coalesced into one request. While the API is failing (see circuit.py)
+    any cached entry is served as is; network errors, or CircuitOpenError
+    when nothing is cached, are raised.
+    """
+    local = fetch_local(clean_name)
+    if local is not None:
+        return local
+    metrics.inc("pokedex_cache_lookups_total", result="miss")
+    # Concurrent sessions asking for the same name share one upstream request
+    return _flights.do(clean_name, lambda: _fetch_upstream(clean_name), timeout=SINGLEFLIGHT_TIMEOUT)
+
+
+def fetch_local(clean_name: str):
+    """The (status_code, Pokemon, stale) answer that needs no request, or None.
+
+    This is the snapshot / offline / cache half of fetch_pokemon, shared with
+    the asyncio API in aio.py.
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        pokemon = snapshot.get(clean_name)
+        if pokemon is not None:
+            metrics.inc("pokedex_cache_lookups_total", result="snapshot")
+            return 200, pokemon, False
+    if OFFLINE:
+        metrics.inc("pokedex_cache_lookups_total", result="offline")
+        return 404, None, False
+
+    entry = get_cache().get(clean_name)
+    if entry is not None and entry.is_fresh():
+        metrics.inc("pokedex_cache_lookups_total", result="hit" if entry.status == 200 else "negative")
+        return entry.status, entry.data, False
+    if entry is not None and entry.status == 200:
+        metrics.inc("pokedex_cache_lookups_total", result="stale")
+        _refresh_in_background(clean_name)
+        return entry.status, entry.data, True
+    return None
+
+
+_breaker = CircuitBreaker()
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh_in_background(clean_name: str):
+    with _refreshing_lock:
+        if clean_name in _refreshing:
+            return
+        _refreshing.add(clean_name)
+    run_in_background(_refresh, clean_name)
+
+
+def _refresh(clean_name: str):
+    try:
+        _flights.do(clean_name, lambda: _fetch_upstream(clean_name), timeout=SINGLEFLIGHT_TIMEOUT)
+    except network_errors():
+        pass  # the stale entry stays; the next lookup tries again
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(clean_name)
+
+
+def pokemon_url(clean_name: str) -> str:
+    return f"{POKEAPI_URL}/pokemon/{clean_name}"
+
+
+def before_upstream(key: str, cache=None):
+    """Return (entry, answer) ahead of an upstream request.
+
+    `answer` is set when no request should go out after all: another flight
+    filled the cache, or the circuit breaker is open and a cached entry can
+    stand in. With nothing cached and the breaker open, CircuitOpenError is
+    raised. `cache` defaults to the Pokemon cache; other URL-keyed caches
+    (resources.py) pass their own.
+    """
+    if cache is None:
+        cache = get_cache()
+    # A flight that just landed may have filled the cache already
+    entry = cache.get(key)
+    if entry is not None and entry.is_fresh():
+        return entry, (entry.status, entry.data, False)
+    if entry is None:
+        _breaker.check("PokeAPI")
+    elif not _breaker.allow():
+        return entry, (entry.status, entry.data, True)
+    return entry, None
+
+
+def upstream_failed(entry):
+    """Record a network error; the stale answer to serve instead, or None to re-raise."""
+    _breaker.record_failure()
+    if entry is not None:
+        return entry.status, entry.data, True
+    return None
+
+
+def _decode_pokemon(payload: dict):
+    with metrics.timer("pokedex_decode_seconds", source="api"):
+        return Pokemon.from_api(payload)
+
+
+def after_upstream(key: str, entry, response, cache=None, decode=_decode_pokemon):
+    """Turn an upstream response into (status_code, data, stale), updating the cache.
+
+    `response` needs status_code, headers and json(), so both the requests
+    client and aioclient responses work. `decode` turns a 200 payload into
+    what gets cached; by default a Pokemon.
+    """
+    if response.status_code == 429 or response.status_code >= 500:
+        stale = upstream_failed(entry)
+        return stale if stale is not None else (response.status_code, None, False)
+    _breaker.record_success()
+
+    if cache is None:
+        cache = get_cache()
+    if response.status_code == 304 and entry is not None:
+        entry = cache.refresh(key, entry)
+        return entry.status, entry.data, False
+    if response.status_code == 200:
+        data = decode(response.json())
+        cache.put(key, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return 200, data, False
+    if response.status_code == 404:
+        cache.put_missing(key)
+    return response.status_code, None, False
+
+
+def _fetch_upstream(clean_name: str):
+    entry, answer = before_upstream(clean_name)
+    if answer is not None:
+        return answer
+    try:
+        response = client.get(pokemon_url(clean_name), headers=entry.validators() if entry is not None else {})
+    except client.request_errors():
+        stale = upstream_failed(entry)
+        if stale is None:
+            raise
+        return stale
+    return after_upstream(clean_name, entry, response)
+
+
+def network_errors():
+    """The failures a lookup reports instead of raising: network errors, timeouts and an open circuit.
+
+    A function so that requests is only imported once something has gone
+    wrong; lookups answered from the cache never need it.
+    """
+    return (*client.request_errors(), TimeoutError, CircuitOpenError)
+
 
 def get_pokemon_data(pokemon_name: str):
     """Clean, centralized API fetcher with error handling."""
+    result = lookup(pokemon_name)
+    if result.error is not None and result.name:
+        print(f"Network error: {result.error}")
+    return result.data
+
+
+def lookup(pokemon_name: str) -> LookupResult:
+    """Like get_pokemon_data, but reports why a lookup failed instead of printing.
+
+    Unknown names are rejected from the local name index, with suggestions.
+    A 404 status means the Pokemon doesn't exist; a network failure, or an
+    API known to be down, comes back as `error` with no status.
+    """
+    clean_name = normalize_name(pokemon_name)
+    if not clean_name:
+        return LookupResult(clean_name, None, None, ValueError("empty Pokemon name"))
+
+    # Answer typos locally instead of paying a round-trip for a 404
+    index = get_name_index()
+    if index is not None and not clean_name.isdigit() and clean_name not in index:
+        return LookupResult(clean_name, 404, None, suggestions=tuple(index.suggest(clean_name)))
     try:
-        clean_name = pokemon_name.strip().lower()
-        if not clean_name:
-            return None
-        response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{clean_name}", timeout=5)
-        return response.json() if response.status_code == 200 else None
-    except requests.exceptions.RequestException as e:
-        print(f"Network error: {e}")
-        return None
\ No newline at end of file
+        status, data, stale = fetch_pokemon(clean_name)
+        return LookupResult(clean_name, status, data, stale=stale)
+    except network_errors() as e:
+        return LookupResult(clean_name, None, None, e)
+
+
+_executor = None
+_background_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> "ThreadPoolExecutor":
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="pokeapi")
+        return _executor
+
+
+def run_in_background(fn, *args, **kwargs):
+    """Run fn on a shared background thread and return its Future.
+
+    This pool is separate from the fetch pool, so background jobs may call
+    get_many_pokemon without deadlocking it.
+    """
+    global _background_executor
+    with _executor_lock:
+        if _background_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _background_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="pokeapi-bg")
+    return _background_executor.submit(fn, *args, **kwargs)
+
+
+def get_many_pokemon(names):
+    """Fetch several Pokemon concurrently, returning LookupResults in input order.
+
+    Duplicate names are fetched once. Concurrency is bounded by MAX_WORKERS,
+    so a battle costs about one round-trip instead of one per fighter.
+    """
+    clean_names = [normalize_name(name) for name in names]
+    unique = list(dict.fromkeys(clean_names))
+    if len(unique) == 1:
+        results = {unique[0]: lookup(unique[0])}
+    else:
+        executor = _get_executor()
+        results = dict(zip(unique, executor.map(lookup, unique)))
+    return [results[name] for name in clean_names]
+
+
+_prefetches = {}
+_prefetch_lock = threading.Lock()
+
+
+def _prefetch(clean_name, warm):
+    result = lookup(clean_name)
+    if warm is not None:
+        # Warming is a bonus: its failure must not fail the lookup everyone waits on
+        try:
+            warm(result)
+        except Exception as e:
+            print(f"Could not warm up {clean_name}: {e}")
+    return result
+
+
+def prefetch(pokemon_name: str, warm=None):
+    """Start loading a Pokemon into the cache in the background.
+
+    Returns a Future of its LookupResult, or None for empty or unknown names.
+    Prefetches of the same name share one Future while it is in flight.
+    `warm`, if given, also runs on the result in the background (e.g. to
+    cache its artwork); errors it raises are printed, not passed on.
+    """
+    clean_name = normalize_name(pokemon_name)
+    if not is_known_name(clean_name):
+        return None
+    with _prefetch_lock:
+        future = _prefetches.get(clean_name)
+        if future is None:
+            future = _prefetches[clean_name] = run_in_background(_prefetch, clean_name, warm)
+            future.add_done_callback(lambda f: _forget_prefetch(clean_name, f))
+        return future
+
+
+def _forget_prefetch(clean_name, future):
+    with _prefetch_lock:
+        if _prefetches.get(clean_name) is future:
+            del _prefetches[clean_name]
@@ -0,0 +1,71 @@
+"""Cache warm-up for server boot, so the first battles after a deploy don't pay full API latency.
+
+start() loads the name index, the most popular Pokemon (POKEDEX_WARMUP_NAMES,
+plus the top of the battle history) and their artwork into the caches on a
+background thread, then builds the rank index. The Streamlit pages call it
+on every run; only the first call in a process does anything. Run
+`python pokemon.py warmup` to do the same from a deploy script.
+"""
+import os
+import threading
+import time
+
+import utils
+
+ENABLED = os.environ.get("POKEDEX_WARMUP", "1") not in ("", "0")
+POPULAR_NAMES = [
+    name.strip() for name in os.environ.get(
+        "POKEDEX_WARMUP_NAMES",
+        "pikachu,charizard,mewtwo,lucario,gengar,greninja,eevee,garchomp,dragonite,blastoise,"
+        "venusaur,gyarados,snorlax,umbreon,rayquaza,bulbasaur,charmander,squirtle,mew,arcanine",
+    ).split(",") if name.strip()
+]
+# How many of the most-battled Pokemon from the history to add to the list
+HISTORY_TOP = int(os.environ.get("POKEDEX_WARMUP_HISTORY_TOP", 20))
+
+_started = None
+_lock = threading.Lock()
+
+
+def popular_names(history_top=None) -> list:
+    """POPULAR_NAMES followed by the history's biggest winners, without duplicates."""
+    history_top = HISTORY_TOP if history_top is None else history_top
+    found = [utils.normalize_name(name) for name in POPULAR_NAMES]
+    if history_top > 0:
+        import history
+        found += [name for _, name, *_ in history.get_history().leaderboard(history_top)]
+    return list(dict.fromkeys(found))
+
+
+def warm_up(names=None, artwork=True, progress=None) -> dict:
+    """Load names (default: popular_names()) into the caches now; returns a summary.
+
+    Failures are only counted: warm-up must never break the page that started it.
+    """
+    start = time.perf_counter()
+    utils.get_name_index()
+    names = popular_names() if names is None else names
+    results = utils.get_many_pokemon(names)
+    ok = [result for result in results if result.ok]
+    if artwork:
+        from artwork import get_artwork
+        for _ in utils._get_executor().map(get_artwork, [result.data.artwork for result in ok]):
+            pass
+    import ranks
+    ranks.get_index()
+    summary = {"names": len(results), "ok": len(ok), "failed": len(results) - len(ok),
+               "seconds": round(time.perf_counter() - start, 3)}
+    if progress is not None:
+        progress(summary)
+    return summary
+
+
+def start(names=None, artwork=True):
+    """Start warm_up in the background once per process; returns its Future (None when disabled)."""
+    global _started
+    if not ENABLED or utils.OFFLINE:
+        return None
+    with _lock:
+        if _started is None:
+            _started = utils.run_in_background(warm_up, names, artwork)
+        return _started